@@ -5,41 +5,253 @@ Production-ready web dashboard for cross-system business impact simulation
 """
 import os
 import sys
+import gzip
+import heapq
 import json
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, g, render_template, request, jsonify, send_file
 from werkzeug.exceptions import HTTPException
 
 from src.dependency_manager import DependencyManager
-from src.simulation_engine import SimulationEngine
+from src.simulation_engine import BatchStats, SimulationEngine, TraversalCache, SIMULATION_STAGE_SECONDS
 from src.report_generator import ReportGenerator
-from src.models import Scenario
+from src.models import ImpactOverlay, Scenario
 from src.license import get_license
+from src.config_watcher import ConfigWatcher, config_digest, config_fingerprint
+from src.graph_stats import GraphStatsCache
+from src.graph_layout import LayoutService, layout_path_for
+from src.scenario_store import ScenarioStore
+from src.scenario_catalog import get_catalog
+from src.response_cache import ResponseCache, make_etag
+from src.admission import AdmissionController, AdmissionRejected, PRIORITY_HIGH, PRIORITY_LOW
+from src.jobs import Job, JobManager, JobQueueFull, SUCCEEDED, FAILED, CANCELLED
+from src.metrics import REGISTRY
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file upload
 
+DEFAULT_CONFIG_PATH = "config/services.json"
+CONFIG_POLL_INTERVAL = float(os.environ.get('NEXDEX_CONFIG_POLL_INTERVAL', 2.0))
+MAX_BATCH_SIZE = int(os.environ.get('NEXDEX_MAX_BATCH_SIZE', 1000))
+RESPONSE_CACHE_SIZE = int(os.environ.get('NEXDEX_RESPONSE_CACHE_SIZE', 512))
+MAX_SCENARIOS_PER_PAGE = 500
+GZIP_MIN_SIZE = int(os.environ.get('NEXDEX_GZIP_MIN_SIZE', 1024))  # Smaller JSON bodies are sent uncompressed
+
 # Global instances (loaded on startup)
 dependency_manager = None
 simulation_engine = None
 report_generator = None
+config_watcher = None
+graph_stats_cache = GraphStatsCache()
+layout_service = None  # LayoutService persisting next to the loaded config
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE)
+
+# Background jobs for long-running simulations
+job_manager = JobManager(
+    max_workers=int(os.environ.get('NEXDEX_JOB_WORKERS', 2)),
+    max_pending=int(os.environ.get('NEXDEX_JOB_QUEUE', 32)),
+    result_ttl=float(os.environ.get('NEXDEX_JOB_TTL', 600)),
+    max_finished=int(os.environ.get('NEXDEX_JOB_HISTORY', 256))
+)
+
+# Bounds concurrent simulations in request handlers; cached responses never wait
+admission = AdmissionController(
+    max_concurrent=int(os.environ.get('NEXDEX_MAX_SIMULATIONS', 4)),
+    max_queue=int(os.environ.get('NEXDEX_SIMULATION_QUEUE', 16)),
+    queue_timeout=float(os.environ.get('NEXDEX_SIMULATION_QUEUE_TIMEOUT', 2.0))
+)
+
+# SQLite scenario store, used instead of scenarios/*.json when configured
+scenario_store = ScenarioStore(os.environ['NEXDEX_SCENARIO_DB']) if os.environ.get('NEXDEX_SCENARIO_DB') else None
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    'nexdex_http_request_duration_seconds',
+    'Time to build each response, by route',
+    labels=('route', 'method', 'status')
+)
+CONFIG_LOAD_SECONDS = REGISTRY.histogram(
+    'nexdex_config_load_seconds',
+    'Time to load and compile the service configuration'
+)
+BATCH_SCENARIOS = REGISTRY.counter(
+    'nexdex_batch_scenarios',
+    'Failure sets received by the batch simulation endpoint'
+)
+BATCH_SIMULATIONS = REGISTRY.counter(
+    'nexdex_batch_simulations',
+    'Distinct failure sets actually simulated by the batch endpoint'
+)
+
+
+@app.before_request
+def start_request_timer():
+    """Remember when the request started, for the latency histogram"""
+    g.request_start = time.perf_counter()
+
+
+# Registered before compress_response, so it runs after it and includes compression time
+@app.after_request
+def record_request_metrics(response):
+    """Observe request latency labelled by route template (not raw path)"""
+    start = g.get('request_start')
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        REQUEST_SECONDS.observe(time.perf_counter() - start, route, request.method, str(response.status_code))
+    return response
+
+
+def register_metric_callbacks() -> None:
+    """Gauges and cache counters read from live objects at scrape time"""
+    def snapshot_manager():
+        snapshot = current_snapshot()
+        return snapshot.dependency_manager if snapshot is not None else None
+    
+    def graph_size(read):
+        def callback():
+            manager = snapshot_manager()
+            return read(manager) if manager is not None else None
+        return callback
+    
+    REGISTRY.gauge('nexdex_graph_services', 'Services in the loaded configuration',
+                   graph_size(lambda m: len(m.services)))
+    REGISTRY.gauge('nexdex_graph_dependencies', 'Dependency edges in the loaded configuration',
+                   graph_size(lambda m: m.graph.number_of_edges()))
+    REGISTRY.gauge('nexdex_graph_version', 'Mutation counter of the loaded dependency graph',
+                   graph_size(lambda m: m.version))
+    REGISTRY.gauge('nexdex_config_loaded_timestamp_seconds', 'When the current configuration was loaded',
+                   lambda: current_snapshot().loaded_at.timestamp() if current_snapshot() is not None else None)
+    REGISTRY.callback_counter('nexdex_response_cache_requests', 'Serialized response cache lookups',
+                              lambda: {('hit',): response_cache.hits, ('miss',): response_cache.misses},
+                              labels=('result',))
+    REGISTRY.gauge('nexdex_response_cache_entries', 'Serialized responses held in the cache',
+                   lambda: len(response_cache))
+    REGISTRY.callback_counter('nexdex_neighborhood_cache_requests',
+                              'Neighborhood cache lookups for the current configuration',
+                              graph_size(lambda m: {('hit',): m.neighborhood_cache_hits,
+                                                    ('miss',): m.neighborhood_cache_misses}),
+                              labels=('result',))
+    REGISTRY.gauge('nexdex_graph_stats_stale', 'Whether served graph statistics are behind the current graph',
+                   graph_size(lambda m: 0 if graph_stats_cache.get(m)[1] else 1))
+    REGISTRY.gauge('nexdex_jobs', 'Background jobs by state',
+                   lambda: {(state,): count for state, count in job_manager.counts().items()},
+                   labels=('state',))
+    REGISTRY.gauge('nexdex_admission_active', 'Simulations holding an admission slot',
+                   lambda: admission.active)
+    REGISTRY.gauge('nexdex_admission_queued', 'Simulations waiting for an admission slot',
+                   lambda: admission.queued)
+    REGISTRY.callback_counter('nexdex_admission_requests', 'Admission decisions for simulation requests',
+                              lambda: dict([(('admitted',), admission.admitted)] +
+                                           [((reason,), count) for reason, count in admission.rejected.items()]),
+                              labels=('outcome',))
+
+
+register_metric_callbacks()
+
+
+class ServiceSnapshot:
+    """
+    Services built from one version of the configuration
+    
+    Request handlers take one reference via current_snapshot() and use it for
+    the whole request, so a reload never changes the graph mid-request.
+    """
+    __slots__ = ('dependency_manager', 'simulation_engine', 'config_path', 'fingerprint', 'config_hash', 'loaded_at')
+    
+    def __init__(self, dependency_manager, simulation_engine, config_path, fingerprint, config_hash, loaded_at):
+        self.dependency_manager = dependency_manager
+        self.simulation_engine = simulation_engine
+        self.config_path = config_path
+        self.fingerprint = fingerprint
+        self.config_hash = config_hash
+        self.loaded_at = loaded_at
+    
+    @property
+    def etag_parts(self) -> Tuple[str, int]:
+        """What a response derived from this snapshot depends on"""
+        return self.config_hash, self.dependency_manager.version
+
+
+_snapshot = None
+_reload_lock = threading.Lock()  # Serializes reloads; never taken by request threads
+
+
+def build_snapshot(config_path: str) -> ServiceSnapshot:
+    """Load the config and build a new snapshot (off the request path)"""
+    # Fingerprint first: a write racing the load is seen as a newer change
+    fingerprint = config_fingerprint(config_path)
+    config_hash = config_digest(config_path)
+    with CONFIG_LOAD_SECONDS.time():
+        manager = DependencyManager()
+        manager.load_config(config_path)
+        manager.compile()
+    return ServiceSnapshot(
+        dependency_manager=manager,
+        simulation_engine=SimulationEngine(manager),
+        config_path=config_path,
+        fingerprint=fingerprint,
+        config_hash=config_hash,
+        loaded_at=datetime.now()
+    )
+
+
+def install_snapshot(snapshot: ServiceSnapshot) -> List[threading.Thread]:
+    """Atomically publish a snapshot to new requests, returning the warm-up threads it started"""
+    global _snapshot, dependency_manager, simulation_engine
+    _snapshot = snapshot
+    dependency_manager = snapshot.dependency_manager
+    simulation_engine = snapshot.simulation_engine
+    threads = [
+        graph_stats_cache.refresh(snapshot.dependency_manager),
+        get_layout_service(snapshot).refresh(snapshot.dependency_manager)
+    ]
+    return [thread for thread in threads if thread is not None]
+
+
+def get_layout_service(snapshot: ServiceSnapshot) -> LayoutService:
+    """Get the layout service for a snapshot's config source"""
+    global layout_service
+    
+    path = layout_path_for(snapshot.config_path)
+    if layout_service is None or layout_service.path != path:
+        layout_service = LayoutService(path)
+    return layout_service
 
 
-def initialize_services(config_path: str = "config/services.json"):
+def current_snapshot() -> ServiceSnapshot:
+    """Get the snapshot new requests should use"""
+    return _snapshot
+
+
+def reload_services(config_path: str) -> None:
+    """Rebuild services from the config and swap them in"""
+    with _reload_lock:
+        snapshot = build_snapshot(config_path)
+        install_snapshot(snapshot)
+    print(f"Reloaded configuration from {config_path} "
+          f"({len(snapshot.dependency_manager.services)} services)")
+
+
+def initialize_services(config_path: str = DEFAULT_CONFIG_PATH):
     """Initialize NexDex services"""
-    global dependency_manager, simulation_engine, report_generator
+    global report_generator
     
     try:
-        dependency_manager = DependencyManager()
-        dependency_manager.load_from_json(config_path)
-        simulation_engine = SimulationEngine(dependency_manager)
+        install_snapshot(build_snapshot(config_path))
         report_generator = ReportGenerator()
         return True
     except Exception as e:
@@ -47,50 +259,182 @@ def initialize_services(config_path: str = "config/services.json"):
         return False
 
 
+def preload_services(config_path: str = DEFAULT_CONFIG_PATH) -> bool:
+    """
+    Initialize services and wait for their warm-up (for pre-forking servers)
+    
+    Workers forked afterwards share the loaded graph, statistics and layout
+    copy-on-write, and no helper thread is left running (or holding a lock)
+    at fork time.
+    """
+    global report_generator
+    
+    try:
+        threads = install_snapshot(build_snapshot(config_path))
+        report_generator = ReportGenerator()
+    except Exception as e:
+        print(f"Error initializing services: {e}")
+        return False
+    for thread in threads:
+        thread.join()
+    return True
+
+
+def start_config_watcher(config_path: str = DEFAULT_CONFIG_PATH, interval: float = CONFIG_POLL_INTERVAL):
+    """Start the background watcher that hot-reloads the config"""
+    global config_watcher
+    
+    if config_watcher is not None:
+        return config_watcher
+    
+    initial = _snapshot.fingerprint if _snapshot is not None else None
+    config_watcher = ConfigWatcher(config_path, reload_services, interval=interval, initial=initial)
+    config_watcher.start()
+    return config_watcher
+
+
 def load_scenario(scenario_name: str) -> Scenario:
-    """Load a scenario from the scenarios directory"""
-    scenarios_dir = Path("scenarios")
-    filepath = scenarios_dir / f"{scenario_name}.json"
+    """Load a scenario from the scenarios directory (or the scenario store when configured)"""
+    with SIMULATION_STAGE_SECONDS.time('load'):
+        if scenario_store is not None:
+            scenario = scenario_store.get(scenario_name)
+            if scenario is None:
+                raise FileNotFoundError(f"Scenario '{scenario_name}' not found")
+            return scenario
+        
+        return get_catalog("scenarios").get(scenario_name)
+
+
+def scenario_revision() -> Tuple:
+    """What scenario listings currently depend on (store revision or file metadata)"""
+    if scenario_store is not None:
+        return 'store', str(scenario_store.db_path.resolve()), scenario_store.revision()
+    return 'catalog', get_catalog("scenarios").fingerprint()
+
+
+def client_accepts_gzip() -> bool:
+    """Whether the request's Accept-Encoding allows gzip"""
+    return request.accept_encodings['gzip'] > 0
+
+
+@app.after_request
+def compress_response(response):
+    """Gzip JSON responses large enough to benefit, when the client accepts it"""
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.mimetype != 'application/json'
+        or 'Content-Encoding' in response.headers
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+    ):
+        return response
     
-    if not filepath.exists():
-        raise FileNotFoundError(f"Scenario '{scenario_name}' not found")
+    response.vary.add('Accept-Encoding')
+    if response.content_length is None or response.content_length < GZIP_MIN_SIZE or not client_accepts_gzip():
+        return response
     
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+    response.set_data(gzip.compress(response.get_data()))
+    response.headers['Content-Encoding'] = 'gzip'
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-gzip")
+    return response
+
+
+def admission_rejected_response(error: AdmissionRejected):
+    """JSON error response for a request turned away by admission control"""
+    response = jsonify({'success': False, 'error': str(error), 'retry_after': error.retry_after})
+    response.status_code = error.status
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def cached_json_response(key: Tuple, build, priority: Optional[int] = None) -> Any:
+    """
+    Serve a deterministic JSON payload with a strong ETag
     
-    return Scenario.from_dict(data)
+    `key` must cover everything the payload depends on (config hash,
+    request parameters, scenario content). GET/HEAD requests whose
+    If-None-Match names the tag get a 304 without building anything; other
+    requests are served from the serialized response cache, calling
+    `build()` only on a miss. With a `priority`, a miss waits for an
+    admission slot first (and may raise AdmissionRejected).
+    """
+    etag = make_etag(*key)
+    # Each content coding is its own representation with its own strong tag
+    gzip_etag = f"{etag}-gzip"
+    if request.method in ('GET', 'HEAD') and (
+        request.if_none_match.contains(etag) or request.if_none_match.contains(gzip_etag)
+    ):
+        response = app.response_class(status=304)
+        response.set_etag(gzip_etag if request.if_none_match.contains(gzip_etag) else etag)
+    else:
+        body = response_cache.get(etag)
+        if body is None:
+            if priority is None:
+                body = jsonify(build()).get_data()
+            else:
+                with admission.acquire(priority):
+                    body = jsonify(build()).get_data()
+            response_cache.put(etag, body)
+        
+        if len(body) >= GZIP_MIN_SIZE and client_accepts_gzip():
+            compressed = response_cache.get(gzip_etag)
+            if compressed is None:
+                compressed = gzip.compress(body)
+                response_cache.put(gzip_etag, compressed)
+            response = app.response_class(compressed, mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+            response.set_etag(gzip_etag)
+        else:
+            response = app.response_class(body, mimetype='application/json')
+            response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    return response
+
 
+def format_scenario(scenario: Scenario) -> Dict[str, Any]:
+    """Format scenario metadata for templates and JSON responses"""
+    return {
+        'name': scenario.name,
+        'failed_services': scenario.failed_services,
+        'description': scenario.description,
+        'tags': scenario.tags,
+        'created_at': scenario.created_at.isoformat(),
+        'peak_hours': scenario.peak_hours
+    }
 
-def get_all_scenarios() -> List[Dict[str, Any]]:
-    """Get all scenarios with metadata"""
-    scenarios_dir = Path("scenarios")
-    scenarios = []
+
+def get_all_scenarios(tag: str = None, limit: int = None, offset: int = 0) -> List[Dict[str, Any]]:
+    """Get all scenarios with metadata, optionally filtered by tag and paginated"""
+    if scenario_store is not None:
+        return [format_scenario(s) for s in scenario_store.list(tag=tag, limit=limit, offset=offset)]
     
-    if not scenarios_dir.exists():
-        return scenarios
+    catalog_scenarios, errors = get_catalog("scenarios").scan()
+    for filename, error in errors:
+        print(f"Error loading {filename}: {error}")
     
-    for filepath in sorted(scenarios_dir.glob("*.json")):
-        try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            scenario = Scenario.from_dict(data)
-            scenarios.append({
-                'name': scenario.name,
-                'failed_services': scenario.failed_services,
-                'description': scenario.description,
-                'tags': scenario.tags,
-                'created_at': scenario.created_at.isoformat(),
-                'peak_hours': scenario.peak_hours
-            })
-        except Exception as e:
-            print(f"Error loading {filepath.name}: {e}")
+    scenarios = [
+        format_scenario(scenario) for scenario in catalog_scenarios
+        if not tag or tag.lower() in [t.lower() for t in scenario.tags]
+    ]
     
-    return scenarios
+    end = None if limit is None else offset + limit
+    return scenarios[offset:end]
+
 
+def count_scenarios(tag: str = None) -> int:
+    """Count scenarios, optionally filtered by tag"""
+    if scenario_store is not None:
+        return scenario_store.count(tag=tag)
+    return len(get_all_scenarios(tag=tag))
 
-def format_impact_summary(result) -> Dict[str, Any]:
+
+def format_impact_summary(result, engine: SimulationEngine) -> Dict[str, Any]:
     """Format simulation result for JSON response"""
-    summary = simulation_engine.get_impact_summary(result)
+    summary = engine.get_impact_summary(result)
     
     return {
         'total_services_affected': summary['total_services_affected'],
@@ -104,25 +448,178 @@ def format_impact_summary(result) -> Dict[str, Any]:
     }
 
 
-def format_detailed_impacts(result) -> List[Dict[str, Any]]:
-    """Format detailed impact information"""
-    impacts = []
+def format_impact(impact) -> Dict[str, Any]:
+    """Format one service's impact"""
+    failure_type = "Direct" if impact.is_direct_failure else f"Cascade (depth: {impact.cascade_depth})"
+    bp = impact.affected_business_processes[0] if impact.affected_business_processes else "N/A"
     
-    for impact in sorted(result.impacts, key=lambda x: x.impact_score, reverse=True):
-        failure_type = "Direct" if impact.is_direct_failure else f"Cascade (depth: {impact.cascade_depth})"
-        bp = impact.affected_business_processes[0] if impact.affected_business_processes else "N/A"
+    return {
+        'service': impact.service.name,
+        'impact_score': round(impact.impact_score, 2),
+        'failure_type': failure_type,
+        'business_process': bp,
+        'estimated_downtime': impact.estimated_downtime,
+        'service_importance': impact.service.importance,
+        'cascade_depth': impact.cascade_depth
+    }
+
+
+IMPACT_FIELDS = (
+    'service', 'impact_score', 'failure_type', 'business_process',
+    'estimated_downtime', 'service_importance', 'cascade_depth'
+)
+
+# Sort keys read ImpactResult attributes directly, so only the selected page is formatted
+IMPACT_SORT_KEYS = {
+    'impact_score': lambda i: i.impact_score,
+    'service': lambda i: i.service.name,
+    'cascade_depth': lambda i: i.cascade_depth,
+    'estimated_downtime': lambda i: i.estimated_downtime,
+    'service_importance': lambda i: i.service.importance,
+    'business_process': lambda i: i.affected_business_processes[0] if i.affected_business_processes else ""
+}
+
+
+@dataclass(frozen=True)
+class ImpactQuery:
+    """Which impacts a response includes: sort order, page and fields"""
+    sort: str = '-impact_score'  # Field name, '-' prefix for descending
+    limit: Optional[int] = None
+    offset: int = 0
+    fields: Optional[Tuple[str, ...]] = None
+    
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None or self.offset > 0
+    
+    @classmethod
+    def from_request(cls, data: Optional[Dict[str, Any]] = None) -> 'ImpactQuery':
+        """Read ?limit=&offset=&sort=&fields= (query string first, then the JSON body)"""
+        data = data or {}
         
-        impacts.append({
-            'service': impact.service.name,
-            'impact_score': round(impact.impact_score, 2),
-            'failure_type': failure_type,
-            'business_process': bp,
-            'estimated_downtime': impact.estimated_downtime,
-            'service_importance': impact.service.importance,
-            'cascade_depth': impact.cascade_depth
-        })
+        def param(name):
+            return request.args.get(name, data.get(name))
+        
+        sort = param('sort') or cls.sort
+        if not isinstance(sort, str):
+            raise ValueError('sort must be a string')
+        if sort.lstrip('-') not in IMPACT_SORT_KEYS:
+            raise ValueError(f"Unknown sort field '{sort.lstrip('-')}' (use one of: {', '.join(IMPACT_SORT_KEYS)})")
+        
+        try:
+            limit = param('limit')
+            limit = None if limit in (None, '') else int(limit)
+            offset = int(param('offset') or 0)
+        except (TypeError, ValueError):
+            raise ValueError('limit and offset must be integers')
+        if (limit is not None and limit < 0) or offset < 0:
+            raise ValueError('limit and offset must not be negative')
+        
+        fields = param('fields')
+        if fields:
+            if isinstance(fields, str):
+                fields = [f.strip() for f in fields.split(',') if f.strip()]
+            elif not isinstance(fields, list) or not all(isinstance(f, str) for f in fields):
+                raise ValueError('fields must be a comma-separated string or a list of strings')
+            unknown = [f for f in fields if f not in IMPACT_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown field '{unknown[0]}' (use any of: {', '.join(IMPACT_FIELDS)})")
+            fields = tuple(fields)
+        else:
+            fields = None
+        
+        return cls(sort=sort, limit=limit, offset=offset, fields=fields)
+    
+    def select(self, impacts: List) -> List:
+        """Sorted page of impacts; heap selection when only the top of the order is needed"""
+        key = IMPACT_SORT_KEYS[self.sort.lstrip('-')]
+        descending = self.sort.startswith('-')
+        if self.limit is None:
+            ordered = sorted(impacts, key=key, reverse=descending)
+        else:
+            # Same order as a full sort, in O(n log k) for the k impacts kept
+            keep = self.offset + self.limit
+            ordered = (heapq.nlargest if descending else heapq.nsmallest)(keep, impacts, key=key)
+        end = None if self.limit is None else self.offset + self.limit
+        return ordered[self.offset:end]
+    
+    def project(self, formatted: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the requested fields of a formatted impact"""
+        if self.fields is None:
+            return formatted
+        return {field: formatted[field] for field in self.fields}
+
+
+DEFAULT_IMPACT_QUERY = ImpactQuery()
+
+
+def format_detailed_impacts(result, query: ImpactQuery = DEFAULT_IMPACT_QUERY) -> List[Dict[str, Any]]:
+    """Format detailed impact information (sorted by impact score unless `query` says otherwise)"""
+    return [query.project(format_impact(impact)) for impact in query.select(result.impacts)]
+
+
+# ============================================================================
+# STREAMING RESPONSES
+# ============================================================================
+
+STREAM_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream'
+}
+
+
+def requested_stream_format() -> Optional[str]:
+    """
+    Streaming mode asked for by the client, or None for a single JSON document
+    
+    Chosen with ?stream=ndjson|sse or an Accept header preferring
+    application/x-ndjson or text/event-stream.
+    """
+    fmt = request.args.get('stream')
+    if fmt:
+        if fmt not in STREAM_MIMETYPES:
+            raise ValueError(f"Unknown stream format '{fmt}' (use ndjson or sse)")
+        return fmt
+    
+    best = request.accept_mimetypes.best_match(['application/json'] + list(STREAM_MIMETYPES.values()))
+    for fmt, mimetype in STREAM_MIMETYPES.items():
+        if best == mimetype:
+            return fmt
+    return None
+
+
+def encode_event(event: str, data: Dict[str, Any], fmt: str) -> str:
+    """Encode one event as an NDJSON line or an SSE message"""
+    if fmt == 'sse':
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({'event': event, 'data': data}) + "\n"
+
+
+def stream_response(events: Iterator[Tuple[str, Dict[str, Any]]], fmt: str, priority: Optional[int] = None):
+    """
+    Stream (event, data) pairs as they are produced
+    
+    An exception after the response has started is sent as a final
+    'error' event, since the status code can no longer change. With a
+    `priority`, an admission slot is taken before the response starts (or
+    AdmissionRejected raised) and held until the stream is closed.
+    """
+    slot = admission.acquire(priority) if priority is not None else None
     
-    return impacts
+    def generate():
+        try:
+            for event, data in events:
+                yield encode_event(event, data, fmt)
+        except Exception as e:
+            yield encode_event('error', {'success': False, 'error': str(e)}, fmt)
+    
+    response = app.response_class(generate(), mimetype=STREAM_MIMETYPES[fmt])
+    if slot is not None:
+        # Runs even if the client disconnects before the stream starts
+        response.call_on_close(slot.release)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Don't let a proxy buffer the stream
+    return response
 
 
 # ============================================================================
@@ -141,14 +638,37 @@ def index():
 
 @app.route('/api/scenarios')
 def api_list_scenarios():
-    """API endpoint to list all scenarios"""
+    """API endpoint to list scenarios (supports ?tag=, ?page= and ?per_page=)"""
     try:
-        scenarios = get_all_scenarios()
-        return jsonify({
-            'success': True,
-            'scenarios': scenarios,
-            'count': len(scenarios)
-        })
+        tag = request.args.get('tag') or None
+        page = request.args.get('page', type=int)
+        per_page = request.args.get('per_page', type=int)
+        if (page is None and 'page' in request.args) or (page is not None and page < 1):
+            return jsonify({'success': False, 'error': 'page must be a positive integer'}), 400
+        if (per_page is None and 'per_page' in request.args) or (per_page is not None and per_page < 1):
+            return jsonify({'success': False, 'error': 'per_page must be a positive integer'}), 400
+        page = page or 1
+        if per_page is not None:
+            per_page = min(per_page, MAX_SCENARIOS_PER_PAGE)
+        
+        def build():
+            if per_page:
+                scenarios = get_all_scenarios(tag=tag, limit=per_page, offset=(page - 1) * per_page)
+                total = count_scenarios(tag=tag)
+            else:
+                scenarios = get_all_scenarios(tag=tag)
+                total = len(scenarios)
+            
+            return {
+                'success': True,
+                'scenarios': scenarios,
+                'count': len(scenarios),
+                'total': total,
+                'page': page if per_page else 1
+            }
+        
+        key = ('scenarios', scenario_revision(), tag.lower() if tag else None, page, per_page)
+        return cached_json_response(key, build)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -158,7 +678,7 @@ def api_get_scenario(scenario_name: str):
     """API endpoint to get scenario details"""
     try:
         scenario = load_scenario(scenario_name)
-        return jsonify({
+        return cached_json_response(('scenario', scenario.to_dict()), lambda: {
             'success': True,
             'name': scenario.name,
             'description': scenario.description,
@@ -173,52 +693,400 @@ def api_get_scenario(scenario_name: str):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@app.route('/api/simulate', methods=['POST'])
+def build_simulation_payload(
+    engine: SimulationEngine,
+    result,
+    scenario_name: str = None,
+    query: ImpactQuery = DEFAULT_IMPACT_QUERY
+) -> Dict[str, Any]:
+    """
+    Build the JSON payload for one simulation result
+    
+    When `query` selects a page, `impacts` and `affected_services` cover only
+    that page; `impacts_total` and `summary` still describe the whole result.
+    """
+    with SIMULATION_STAGE_SECONDS.time('format'):
+        return _build_simulation_payload(engine, result, scenario_name, query)
+
+
+def _build_simulation_payload(
+    engine: SimulationEngine,
+    result,
+    scenario_name: str,
+    query: ImpactQuery
+) -> Dict[str, Any]:
+    selected = query.select(result.impacts)
+    
+    # Get impacts
+    impacts = [query.project(format_impact(impact)) for impact in selected]
+    summary = format_impact_summary(result, engine)
+    
+    # Get top business processes
+    top_processes = engine.get_top_business_processes(result, limit=5)
+    
+    # Get affected services
+    affected = selected if query.paginated else result.impacts
+    affected_services = {impact.service.name: impact.impact_score for impact in affected}
+    
+    return {
+        'success': True,
+        'scenario_name': scenario_name,
+        'summary': summary,
+        'impacts': impacts,
+        'impacts_total': len(result.impacts),
+        'top_processes': [{'name': p[0], 'impact_score': round(p[1], 2)} for p in top_processes],
+        'affected_services': {k: round(v, 2) for k, v in affected_services.items()}
+    }
+
+
+def format_comparison_side(
+    engine: SimulationEngine,
+    scenario: Scenario,
+    result,
+    query: ImpactQuery = DEFAULT_IMPACT_QUERY
+) -> Dict[str, Any]:
+    """Format one side of a scenario comparison"""
+    with SIMULATION_STAGE_SECONDS.time('format'):
+        return {
+            'name': scenario.name,
+            'summary': format_impact_summary(result, engine),
+            'impacts': format_detailed_impacts(result, query),
+            'impacts_total': len(result.impacts),
+            'failed_services': scenario.failed_services
+        }
+
+
+def format_comparison(engine: SimulationEngine, result1, result2) -> Dict[str, Any]:
+    """Format the differences between two simulation results"""
+    comparison = engine.compare_results(result1, result2)
+    worse_scenario = "Scenario 2" if comparison["worse_scenario"] == result2 else "Scenario 1"
+    
+    return {
+        'impact_diff': round(comparison['impact_diff'], 2),
+        'impact_pct_diff': round(comparison['impact_pct_diff'], 1),
+        'services_diff': comparison['services_diff'],
+        'worse_scenario': worse_scenario,
+        'unique_to_first': list(comparison['unique_to_first']),
+        'unique_to_second': list(comparison['unique_to_second'])
+    }
+
+
+def build_comparison_payload(
+    engine: SimulationEngine,
+    scenario1: Scenario,
+    scenario2: Scenario,
+    query: ImpactQuery = DEFAULT_IMPACT_QUERY
+) -> Dict[str, Any]:
+    """Run two scenarios and build the JSON comparison payload"""
+    # Run simulations
+    result1 = engine.simulate_failure(scenario1.failed_services, peak_hours=scenario1.peak_hours)
+    result2 = engine.simulate_failure(scenario2.failed_services, peak_hours=scenario2.peak_hours)
+    
+    return {
+        'success': True,
+        'scenario1': format_comparison_side(engine, scenario1, result1, query),
+        'scenario2': format_comparison_side(engine, scenario2, result2, query),
+        'comparison': format_comparison(engine, result1, result2)
+    }
+
+
+def comparison_events(
+    engine: SimulationEngine,
+    scenario1: Scenario,
+    scenario2: Scenario,
+    query: ImpactQuery = DEFAULT_IMPACT_QUERY
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Events for a streamed comparison: each scenario as it finishes, then the comparison"""
+    result1 = engine.simulate_failure(scenario1.failed_services, peak_hours=scenario1.peak_hours)
+    yield 'scenario', {'position': 1, **format_comparison_side(engine, scenario1, result1, query)}
+    result2 = engine.simulate_failure(scenario2.failed_services, peak_hours=scenario2.peak_hours)
+    yield 'scenario', {'position': 2, **format_comparison_side(engine, scenario2, result2, query)}
+    yield 'comparison', {'success': True, **format_comparison(engine, result1, result2)}
+
+
+def parse_failure_set(data: Dict[str, Any], default_peak_hours: bool = False) -> Tuple[List[str], bool]:
+    """Validate an ad-hoc failure set from a request body"""
+    failed_services = data.get('failed_services')
+    if isinstance(failed_services, str):
+        failed_services = [failed_services]
+    if not isinstance(failed_services, list) or not failed_services \
+            or not all(isinstance(name, str) for name in failed_services):
+        raise ValueError('failed_services must be a non-empty list of service names')
+    return failed_services, bool(data.get('peak_hours', default_peak_hours))
+
+
+def parse_overlay(data: Dict[str, Any]) -> ImpactOverlay:
+    """
+    Read per-request what-if overrides from a request body
+    
+    {"overrides": {"process_importance": {"Billing": 10}, "mttr": {"Database": 90}}}
+    """
+    overrides = data.get('overrides')
+    if overrides is not None and not isinstance(overrides, dict):
+        raise ValueError('overrides must be an object')
+    return ImpactOverlay.from_dict(overrides)
+
+
+def simulation_request_data() -> Dict[str, Any]:
+    """
+    Simulation parameters from a POST body or, for GET (e.g. EventSource),
+    from ?scenario_name= or ?failed_services=A,B&peak_hours=true
+    """
+    if request.method != 'GET':
+        return request.get_json(silent=True) or {}
+    
+    data: Dict[str, Any] = {}
+    if request.args.get('scenario_name'):
+        data['scenario_name'] = request.args['scenario_name']
+    if request.args.get('failed_services'):
+        data['failed_services'] = [name.strip() for name in request.args['failed_services'].split(',') if name.strip()]
+    if 'peak_hours' in request.args:
+        data['peak_hours'] = request.args['peak_hours'].lower() in ('1', 'true', 'yes')
+    return data
+
+
+def simulation_events(
+    engine: SimulationEngine,
+    failed_services: List[str],
+    peak_hours: bool,
+    overlay: ImpactOverlay,
+    scenario_name: str = None,
+    query: ImpactQuery = DEFAULT_IMPACT_QUERY
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Events for a streamed simulation: start, one impact per service (nearest
+    first), summary. Impacts stream in computation order, so only the
+    query's `fields` apply.
+    """
+    impacts_iter = engine.iter_impacts(failed_services, overlay=overlay)
+    
+    def generate():
+        yield 'start', {'scenario_name': scenario_name, 'failed_services': failed_services, 'peak_hours': peak_hours}
+        impacts = []
+        for impact in impacts_iter:
+            impacts.append(impact)
+            yield 'impact', query.project(format_impact(impact))
+        
+        result = engine.build_result(failed_services, impacts, peak_hours=peak_hours)
+        top_processes = engine.get_top_business_processes(result, limit=5)
+        yield 'summary', {
+            'success': True,
+            'scenario_name': scenario_name,
+            'summary': format_impact_summary(result, engine),
+            'top_processes': [{'name': p[0], 'impact_score': round(p[1], 2)} for p in top_processes]
+        }
+    
+    return generate()
+
+
+@app.route('/api/simulate', methods=['GET', 'POST'])
 def api_simulate():
-    """API endpoint to run a simulation"""
+    """
+    API endpoint to run a simulation of a saved scenario or an ad-hoc failure set
+    
+    With ?stream=ndjson|sse (or a matching Accept header) impacts are sent
+    one event at a time as they are computed instead of in one document.
+    """
     try:
-        data = request.get_json()
+        try:
+            stream_format = requested_stream_format()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        data = simulation_request_data()
         scenario_name = data.get('scenario_name')
+        try:
+            query = ImpactQuery.from_request(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        snapshot = current_snapshot()
+        engine = snapshot.simulation_engine
         
-        if not scenario_name:
-            return jsonify({'success': False, 'error': 'scenario_name is required'}), 400
+        if scenario_name:
+            # Load and run scenario
+            scenario = load_scenario(scenario_name)
+            failed_services, peak_hours = scenario.failed_services, scenario.peak_hours
+        elif 'failed_services' in data:
+            try:
+                failed_services, peak_hours = parse_failure_set(data)
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+        else:
+            return jsonify({'success': False, 'error': 'scenario_name or failed_services is required'}), 400
         
-        # Load and run scenario
-        scenario = load_scenario(scenario_name)
-        result = simulation_engine.simulate_failure(
-            scenario.failed_services,
-            peak_hours=scenario.peak_hours
-        )
+        try:
+            overlay = parse_overlay(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        unknown = [
+            name for name in list(failed_services) + list(overlay.mttr)
+            if name not in snapshot.dependency_manager.services
+        ]
+        if unknown:
+            return jsonify({'success': False, 'error': f"Service '{unknown[0]}' not found in configuration"}), 400
+        
+        if stream_format:
+            return stream_response(
+                simulation_events(engine, failed_services, peak_hours, overlay, scenario_name, query),
+                stream_format,
+                priority=PRIORITY_LOW
+            )
         
-        # Get impacts
-        impacts = format_detailed_impacts(result)
-        summary = format_impact_summary(result)
+        def build():
+            result = engine.simulate_failure(failed_services, peak_hours=peak_hours, overlay=overlay)
+            return build_simulation_payload(engine, result, scenario_name, query)
         
-        # Get top business processes
-        top_processes = simulation_engine.get_top_business_processes(result, limit=5)
+        # The result depends only on the config, the failure set and the
+        # overrides; the payload's timestamp is when it was first computed
+        key = ('simulate', snapshot.etag_parts, scenario_name, failed_services, peak_hours, overlay.to_dict(),
+               query.sort, query.limit, query.offset, query.fields)
+        return cached_json_response(key, build, priority=PRIORITY_HIGH)
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except FileNotFoundError as e:
+        return jsonify({'success': False, 'error': f'Scenario not found: {str(e)}'}), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+def format_batch_entry(
+    engine: SimulationEngine,
+    scenario: Scenario,
+    result,
+    error: Optional[str],
+    include_impacts: bool,
+    query: ImpactQuery = DEFAULT_IMPACT_QUERY
+) -> Dict[str, Any]:
+    """Format one failure set's outcome in a batch response"""
+    if result is None:
+        return {
+            'name': scenario.name,
+            'success': False,
+            'failed_services': scenario.failed_services,
+            'error': error
+        }
+    entry = {
+        'name': scenario.name,
+        'success': True,
+        'failed_services': scenario.failed_services,
+        'summary': format_impact_summary(result, engine),
+        'affected_services': {impact.service.name: round(impact.impact_score, 2) for impact in result.impacts}
+    }
+    if include_impacts:
+        entry['impacts'] = format_detailed_impacts(result, query)
+    return entry
+
+
+@app.route('/api/simulate/batch', methods=['POST'])
+def api_simulate_batch():
+    """
+    API endpoint to simulate many failure sets in one call
+    
+    Body: {"failure_sets": [["A"], {"failed_services": ["B", "C"], "peak_hours": true}, ...],
+           "peak_hours": false, "include_impacts": false, "overrides": {...}}
+    
+    Failure sets are evaluated together: duplicates are simulated once and
+    cascade traversals are shared. Results keep the request order; a set
+    naming an unknown service gets an error entry instead of failing the batch.
+    With ?stream=ndjson|sse each result is sent as soon as it is computed.
+    """
+    try:
+        try:
+            stream_format = requested_stream_format()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        data = request.get_json(silent=True) or {}
+        failure_sets = data.get('failure_sets')
+        if not isinstance(failure_sets, list) or not failure_sets:
+            return jsonify({'success': False, 'error': 'failure_sets must be a non-empty list'}), 400
+        if len(failure_sets) > MAX_BATCH_SIZE:
+            return jsonify({
+                'success': False,
+                'error': f'Too many failure sets ({len(failure_sets)}); the limit is {MAX_BATCH_SIZE}'
+            }), 413
+        
+        default_peak_hours = bool(data.get('peak_hours', False))
+        include_impacts = bool(data.get('include_impacts', False))
+        try:
+            overlay = parse_overlay(data)
+            query = ImpactQuery.from_request(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        # An unknown overlay service would fail every set alike, so it fails the request
+        snapshot = current_snapshot()
+        unknown = [name for name in overlay.mttr if name not in snapshot.dependency_manager.services]
+        if unknown:
+            return jsonify({'success': False, 'error': f"Service '{unknown[0]}' not found in configuration"}), 400
+        
+        scenarios = []
+        for position, entry in enumerate(failure_sets):
+            if not isinstance(entry, dict):
+                entry = {'failed_services': entry}
+            try:
+                failed_services, peak_hours = parse_failure_set(entry, default_peak_hours)
+            except ValueError as e:
+                return jsonify({'success': False, 'error': f'failure_sets[{position}]: {e}'}), 400
+            scenarios.append(Scenario(
+                name=str(entry.get('name', position)),
+                description='',
+                failed_services=failed_services,
+                peak_hours=peak_hours
+            ))
+        
+        engine = snapshot.simulation_engine
+        stats = BatchStats()
+        entries = (
+            format_batch_entry(engine, scenario, result, error, include_impacts, query)
+            for scenario, result, error in engine.iter_simulations(
+                scenarios, stats=stats, overlay=overlay,
+                # One request's failure sets share traversals; the cache dies with the request
+                traversal_cache=TraversalCache()
+            )
+        )
         
-        # Get affected services
-        affected_services = {impact.service.name: impact.impact_score for impact in result.impacts}
+        if stream_format:
+            def events():
+                for entry in entries:
+                    yield 'result', entry
+                BATCH_SCENARIOS.inc(stats.scenarios)
+                BATCH_SIMULATIONS.inc(stats.simulated)
+                yield 'end', {'success': True, 'count': stats.scenarios, 'simulated': stats.simulated, 'errors': stats.errors}
+            return stream_response(events(), stream_format, priority=PRIORITY_LOW)
         
+        with admission.acquire(PRIORITY_LOW):
+            results = list(entries)
+        BATCH_SCENARIOS.inc(stats.scenarios)
+        BATCH_SIMULATIONS.inc(stats.simulated)
         return jsonify({
             'success': True,
-            'scenario_name': scenario_name,
-            'summary': summary,
-            'impacts': impacts,
-            'top_processes': [{'name': p[0], 'impact_score': round(p[1], 2)} for p in top_processes],
-            'affected_services': {k: round(v, 2) for k, v in affected_services.items()}
+            'count': len(results),
+            'simulated': stats.simulated,
+            'errors': stats.errors,
+            'results': results
         })
-    except FileNotFoundError as e:
-        return jsonify({'success': False, 'error': f'Scenario not found: {str(e)}'}), 404
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/compare', methods=['POST'])
 def api_compare():
-    """API endpoint to compare two scenarios"""
+    """API endpoint to compare two scenarios (supports ?stream=ndjson|sse)"""
     try:
+        try:
+            stream_format = requested_stream_format()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
         data = request.get_json()
+        try:
+            query = ImpactQuery.from_request(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         scenario1_name = data.get('scenario1_name')
         scenario2_name = data.get('scenario2_name')
         
@@ -229,50 +1097,190 @@ def api_compare():
         scenario1 = load_scenario(scenario1_name)
         scenario2 = load_scenario(scenario2_name)
         
-        # Run simulations
-        result1 = simulation_engine.simulate_failure(scenario1.failed_services, peak_hours=scenario1.peak_hours)
-        result2 = simulation_engine.simulate_failure(scenario2.failed_services, peak_hours=scenario2.peak_hours)
-        
-        # Get comparison
-        comparison = simulation_engine.compare_results(result1, result2)
-        
-        # Format results
-        summary1 = format_impact_summary(result1)
-        summary2 = format_impact_summary(result2)
-        impacts1 = format_detailed_impacts(result1)
-        impacts2 = format_detailed_impacts(result2)
+        engine = current_snapshot().simulation_engine
+        if stream_format:
+            return stream_response(comparison_events(engine, scenario1, scenario2, query), stream_format,
+                                   priority=PRIORITY_LOW)
+        with admission.acquire(PRIORITY_LOW):
+            return jsonify(build_comparison_payload(engine, scenario1, scenario2, query))
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except FileNotFoundError as e:
+        return jsonify({'success': False, 'error': f'Scenario not found: {str(e)}'}), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ============================================================================
+# BACKGROUND JOBS
+# ============================================================================
+
+def run_simulation_job(job: Job, engine: SimulationEngine, scenario: Scenario, overlay: ImpactOverlay) -> Dict[str, Any]:
+    """Job function: simulate one scenario"""
+    job.set_progress(0, 1)
+    result = engine.simulate_failure(scenario.failed_services, peak_hours=scenario.peak_hours, overlay=overlay)
+    job.set_progress(1)
+    return build_simulation_payload(engine, result, scenario.name)
+
+
+def run_comparison_job(job: Job, engine: SimulationEngine, scenario1: Scenario, scenario2: Scenario) -> Dict[str, Any]:
+    """Job function: compare two scenarios"""
+    job.set_progress(0, 1)
+    payload = build_comparison_payload(engine, scenario1, scenario2)
+    job.set_progress(1)
+    return payload
+
+
+def run_sweep_job(
+    job: Job,
+    engine: SimulationEngine,
+    failure_sets: List[List[str]],
+    peak_hours: bool,
+    overlay: ImpactOverlay
+) -> Dict[str, Any]:
+    """Job function: simulate many failure sets and rank them by impact"""
+    job.set_progress(0, len(failure_sets))
+    cache = TraversalCache()
+    results = []
+    for done, failed_services in enumerate(failure_sets, 1):
+        job.check_cancelled()
+        result = engine.simulate_failure(failed_services, peak_hours=peak_hours, cache=cache, overlay=overlay)
+        results.append({
+            'failed_services': failed_services,
+            'total_impact_score': round(result.total_impact_score, 2),
+            'total_services_affected': result.total_services_affected
+        })
+        job.set_progress(done)
+    
+    results.sort(key=lambda r: r['total_impact_score'], reverse=True)
+    return {'success': True, 'results': results, 'count': len(results)}
+
+
+@app.route('/api/jobs', methods=['POST'])
+def api_submit_job():
+    """API endpoint to submit a simulation, comparison or sweep as a background job"""
+    try:
+        data = request.get_json() or {}
+        job_type = data.get('type', 'simulate')
+        snapshot = current_snapshot()
+        engine = snapshot.simulation_engine
+        try:
+            overlay = parse_overlay(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
-        worse_scenario = "Scenario 2" if comparison["worse_scenario"] == result2 else "Scenario 1"
+        if job_type == 'simulate':
+            if data.get('scenario_name'):
+                scenario = load_scenario(data['scenario_name'])
+            elif 'failed_services' in data:
+                try:
+                    failed_services, peak_hours = parse_failure_set(data)
+                except ValueError as e:
+                    return jsonify({'success': False, 'error': str(e)}), 400
+                scenario = Scenario(
+                    name='ad-hoc',
+                    description='',
+                    failed_services=failed_services,
+                    peak_hours=peak_hours
+                )
+            else:
+                return jsonify({'success': False, 'error': 'scenario_name or failed_services is required'}), 400
+            unknown = [
+                name for name in list(scenario.failed_services) + list(overlay.mttr)
+                if name not in snapshot.dependency_manager.services
+            ]
+            if unknown:
+                return jsonify({'success': False, 'error': f"Service '{unknown[0]}' not found in configuration"}), 400
+            job = job_manager.submit('simulate', run_simulation_job, engine, scenario, overlay, params=data)
+        elif job_type == 'compare':
+            if not data.get('scenario1_name') or not data.get('scenario2_name'):
+                return jsonify({'success': False, 'error': 'Both scenario names are required'}), 400
+            scenario1 = load_scenario(data['scenario1_name'])
+            scenario2 = load_scenario(data['scenario2_name'])
+            job = job_manager.submit('compare', run_comparison_job, engine, scenario1, scenario2, params=data)
+        elif job_type == 'sweep':
+            failure_sets = data.get('failure_sets')
+            if failure_sets is None:
+                # Default sweep: every single-service failure
+                failure_sets = [[name] for name in sorted(snapshot.dependency_manager.services)]
+            else:
+                if not isinstance(failure_sets, list) or not failure_sets:
+                    return jsonify({'success': False, 'error': 'failure_sets must be a non-empty list'}), 400
+                if len(failure_sets) > MAX_BATCH_SIZE:
+                    return jsonify({
+                        'success': False,
+                        'error': f'Too many failure sets ({len(failure_sets)}); the limit is {MAX_BATCH_SIZE}'
+                    }), 413
+                parsed = []
+                for position, entry in enumerate(failure_sets):
+                    if not isinstance(entry, dict):
+                        entry = {'failed_services': entry}
+                    try:
+                        parsed.append(parse_failure_set(entry)[0])
+                    except ValueError as e:
+                        return jsonify({'success': False, 'error': f'failure_sets[{position}]: {e}'}), 400
+                failure_sets = parsed
+            unknown = [
+                name for name in [n for fs in failure_sets for n in fs] + list(overlay.mttr)
+                if name not in snapshot.dependency_manager.services
+            ]
+            if unknown:
+                return jsonify({'success': False, 'error': f"Service '{unknown[0]}' not found in configuration"}), 400
+            job = job_manager.submit(
+                'sweep', run_sweep_job, engine,
+                failure_sets, bool(data.get('peak_hours', False)), overlay,
+                params={k: v for k, v in data.items() if k != 'failure_sets'}
+            )
+        else:
+            return jsonify({'success': False, 'error': f"Unknown job type '{job_type}'"}), 400
         
-        return jsonify({
-            'success': True,
-            'scenario1': {
-                'name': scenario1_name,
-                'summary': summary1,
-                'impacts': impacts1,
-                'failed_services': scenario1.failed_services
-            },
-            'scenario2': {
-                'name': scenario2_name,
-                'summary': summary2,
-                'impacts': impacts2,
-                'failed_services': scenario2.failed_services
-            },
-            'comparison': {
-                'impact_diff': round(comparison['impact_diff'], 2),
-                'impact_pct_diff': round(comparison['impact_pct_diff'], 1),
-                'services_diff': comparison['services_diff'],
-                'worse_scenario': worse_scenario,
-                'unique_to_first': list(comparison['unique_to_first']),
-                'unique_to_second': list(comparison['unique_to_second'])
-            }
-        })
+        return jsonify({'success': True, 'job': job.to_dict()}), 202
+    except JobQueueFull as e:
+        response = jsonify({'success': False, 'error': str(e)})
+        response.status_code = 429
+        response.headers['Retry-After'] = '5'
+        return response
     except FileNotFoundError as e:
         return jsonify({'success': False, 'error': f'Scenario not found: {str(e)}'}), 404
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def api_job_status(job_id: str):
+    """API endpoint to poll a job's status"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def api_job_result(job_id: str):
+    """API endpoint to fetch a finished job's result"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if job.status == SUCCEEDED:
+        return jsonify(job.result)
+    if job.status in (FAILED, CANCELLED):
+        return jsonify({'success': False, 'job': job.to_dict(), 'error': job.error or job.status}), 409
+    
+    response = jsonify({'success': True, 'job': job.to_dict()})
+    response.status_code = 202
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def api_cancel_job(job_id: str):
+    """API endpoint to cancel a job"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+
 @app.route('/scenario/<scenario_name>')
 def scenario_detail(scenario_name: str):
     """Scenario detail page"""
@@ -332,45 +1340,175 @@ def api_license():
 def api_list_services():
     """API endpoint to list all services"""
     try:
-        services = dependency_manager.get_all_services()
-        service_list = [
-            {
-                'name': service.name,
-                'business_process': service.business_process,
-                'importance': service.importance,
-                'mttr': service.mttr,
-                'depends_on': service.depends_on
+        snapshot = current_snapshot()
+        
+        def build():
+            services = snapshot.dependency_manager.get_all_services()
+            service_list = [
+                {
+                    'name': service.name,
+                    'business_process': service.business_process,
+                    'importance': service.importance,
+                    'mttr': service.mttr,
+                    'depends_on': service.depends_on
+                }
+                for service in sorted(services, key=lambda s: s.name)
+            ]
+            return {
+                'success': True,
+                'services': service_list,
+                'count': len(service_list)
             }
-            for service in sorted(services, key=lambda s: s.name)
-        ]
-        return jsonify({
-            'success': True,
-            'services': service_list,
-            'count': len(service_list)
-        })
+        
+        return cached_json_response(('services', snapshot.etag_parts), build)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/graph')
+def api_graph():
+    """
+    API endpoint to get the dependency graph with precomputed node coordinates
+    
+    The layout is computed once per graph structure and persisted; passing
+    ?scenario_name= or ?failed_services=A,B marks each node as failed,
+    affected or normal for that failure.
+    """
+    try:
+        snapshot = current_snapshot()
+        manager = snapshot.dependency_manager
+        layout = get_layout_service(snapshot).get(manager)
+        
+        data = simulation_request_data()
+        failed_services: List[str] = []
+        if data.get('scenario_name'):
+            failed_services = load_scenario(data['scenario_name']).failed_services
+        elif data.get('failed_services'):
+            failed_services = data['failed_services']
+        
+        unknown = [name for name in failed_services if name not in manager.services]
+        if unknown:
+            return jsonify({'success': False, 'error': f"Service '{unknown[0]}' not found in configuration"}), 400
+        
+        def build():
+            impacts = {}
+            if failed_services:
+                result = snapshot.simulation_engine.simulate_failure(failed_services)
+                impacts = {impact.service.name: impact for impact in result.impacts}
+            
+            nodes = []
+            for name, (x, y) in layout.positions.items():
+                service = manager.services[name]
+                node = {
+                    'name': name,
+                    'x': x,
+                    'y': y,
+                    'business_process': service.business_process,
+                    'importance': service.importance,
+                    'status': 'normal'
+                }
+                impact = impacts.get(name)
+                if impact is not None:
+                    node['status'] = 'failed' if impact.is_direct_failure else 'affected'
+                    node['cascade_depth'] = impact.cascade_depth
+                    node['impact_score'] = round(impact.impact_score, 2)
+                nodes.append(node)
+            
+            return {
+                'success': True,
+                'structure_hash': layout.structure_hash,
+                'bounds': layout.bounds(),
+                'nodes': nodes,
+                'edges': [list(edge) for edge in manager.graph.edges()],
+                'failed_services': failed_services,
+                'affected_count': sum(1 for impact in impacts.values() if not impact.is_direct_failure)
+            }
+        
+        key = ('graph', snapshot.etag_parts, layout.structure_hash, sorted(set(failed_services)))
+        return cached_json_response(key, build, priority=PRIORITY_HIGH if failed_services else None)
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except FileNotFoundError as e:
+        return jsonify({'success': False, 'error': f'Scenario not found: {str(e)}'}), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/services/<service_name>/neighborhood')
+def api_service_neighborhood(service_name: str):
+    """API endpoint to get the k-hop neighborhood around a service"""
+    try:
+        hops = int(request.args.get('hops', 1))
+        direction = request.args.get('direction', 'both')
+        snapshot = current_snapshot()
+        neighborhood = snapshot.dependency_manager.get_neighborhood(
+            service_name, hops=hops, direction=direction
+        )
+        if neighborhood is None:
+            return jsonify({'success': False, 'error': f"Service '{service_name}' not found"}), 404
+        
+        key = ('neighborhood', snapshot.etag_parts, service_name, hops, direction)
+        return cached_json_response(key, lambda: {'success': True, **neighborhood.to_dict()})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/statistics')
 def api_statistics():
-    """API endpoint to get system statistics"""
+    """API endpoint to get system statistics (computed once per config version)"""
     try:
-        stats = dependency_manager.get_graph_stats()
-        return jsonify({
-            'success': True,
-            'total_services': stats['total_services'],
-            'total_dependencies': stats['total_dependencies'],
-            'circular_dependencies': stats['circular_dependencies'],
-            'most_critical': [
-                {'service': name, 'dependents': count}
-                for name, count in stats['most_critical']
-            ]
-        })
+        snapshot = current_snapshot()
+        stats, fresh = graph_stats_cache.get(snapshot.dependency_manager)
+        failure = graph_stats_cache.failure(snapshot.dependency_manager)
+        if stats is None and failure is not None:
+            error, retry_after = failure
+            response = jsonify({
+                'success': False,
+                'error': f'Statistics could not be computed: {error}',
+                'retry_after': retry_after
+            })
+            response.status_code = 503
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        if stats is None:
+            response = jsonify({'success': True, 'pending': True})
+            response.status_code = 202
+            response.headers['Retry-After'] = '1'
+            return response
+        
+        def build():
+            return {
+                'success': True,
+                'stale': not fresh,
+                'total_services': stats['total_services'],
+                'total_dependencies': stats['total_dependencies'],
+                'circular_dependencies': stats['circular_dependencies'],
+                'most_critical': [
+                    {'service': name, 'dependents': count}
+                    for name, count in stats['most_critical']
+                ]
+            }
+        
+        if not fresh:
+            # Stale stats belong to an older graph; don't tag them with this one
+            response = jsonify(build())
+            response.headers['Cache-Control'] = 'max-age=0, stale-while-revalidate=30'
+            return response
+        return cached_json_response(('statistics', snapshot.etag_parts), build)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint (404 when NEXDEX_METRICS=0)"""
+    if not REGISTRY.enabled:
+        return jsonify({'success': False, 'error': 'Metrics are disabled'}), 404
+    return app.response_class(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+
 # ============================================================================
 # ERROR HANDLERS
 # ============================================================================
@@ -397,14 +1535,15 @@ if __name__ == '__main__':
         print("Failed to initialize NexDex services")
         sys.exit(1)
     
-def create_app():
+def create_app(config_path: str = DEFAULT_CONFIG_PATH, watch_config: bool = True):
     """Create and configure Flask app (for use with launcher)"""
-    global dependency_manager, simulation_engine, report_generator
-    
     # Initialize services
-    if not initialize_services():
+    if not initialize_services(config_path):
         raise RuntimeError("Failed to initialize services")
     
+    if watch_config:
+        start_config_watcher(config_path)
+    
     return app
 
 
@@ -2,7 +2,11 @@
 """
 NexDex Launcher - Entry point for packaged application
 Opens the Flask dashboard automatically in the default browser
+
+With --production (or NEXDEX_SERVER=production) it instead serves the
+dashboard from a pre-forked pool of worker processes, for shared deployments.
 """
+import argparse
 import os
 import sys
 import webbrowser
@@ -16,7 +20,7 @@ sys.path.insert(0, os.path.join(app_dir, 'dashboard'))
 sys.path.insert(0, os.path.join(app_dir, 'src'))
 
 # Import Flask app
-from dashboard.app import create_app
+from dashboard.app import DEFAULT_CONFIG_PATH, app as flask_app, create_app, preload_services, start_config_watcher
 
 
 def launch_browser(port=5000, retries=10):
@@ -43,22 +47,78 @@ def launch_browser(port=5000, retries=10):
         time.sleep(0.5)
 
 
+def parse_args():
+    """Parse command line options (defaults come from the environment)"""
+    parser = argparse.ArgumentParser(description="NexDex dashboard")
+    parser.add_argument('--production', action='store_true',
+                        default=os.environ.get('NEXDEX_SERVER', '').lower() == 'production',
+                        help='Serve with multiple worker processes instead of the single-process server')
+    parser.add_argument('--host', default=os.environ.get('NEXDEX_HOST', '127.0.0.1'),
+                        help='Address to listen on (default: 127.0.0.1)')
+    # Using 5555 instead of 5000 to avoid conflict with macOS Control Center
+    parser.add_argument('--port', type=int, default=int(os.environ.get('NEXDEX_PORT', 5555)),
+                        help='Port to listen on (default: 5555)')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('NEXDEX_WORKERS', 0)),
+                        help='Worker processes in production mode (default: one per CPU core)')
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('NEXDEX_THREADS', 8)),
+                        help='Request threads per worker in production mode (default: 8)')
+    parser.add_argument('--config', default=os.environ.get('NEXDEX_CONFIG', DEFAULT_CONFIG_PATH),
+                        help='Service config file, directory or glob')
+    parser.add_argument('--no-browser', action='store_true', help='Do not open the dashboard in a browser')
+    # parse_known_args: macOS passes -psn_* to app bundles launched from Finder
+    return parser.parse_known_args()[0]
+
+
+def serve_production(args):
+    """Serve the dashboard from pre-forked worker processes"""
+    from src.prefork import PreforkServer
+    
+    def load_app():
+        # Runs in the parent: workers inherit the loaded graph copy-on-write
+        return flask_app if preload_services(args.config) else None
+    
+    def post_fork():
+        # Threads don't survive fork, so each worker starts its own watcher
+        start_config_watcher(args.config)
+    
+    server = PreforkServer(
+        load_app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers or None,
+        threads=args.threads,
+        post_fork=post_fork
+    )
+    try:
+        server.serve_forever()
+    except (OSError, RuntimeError) as e:
+        print(f"❌ Could not start server: {e}")
+        sys.exit(1)
+    print("\n✅ NexDex dashboard stopped.")
+
+
 def main():
     """Main entry point"""
-    # Get port from environment or use default
-    # Using 5555 instead of 5000 to avoid conflict with macOS Control Center
-    port = int(os.environ.get('NEXDEX_PORT', 5555))
+    args = parse_args()
+    port = args.port
+    
+    if args.production:
+        if hasattr(os, 'fork'):
+            serve_production(args)
+            return
+        print("⚠️  Production mode needs os.fork; serving from a single process instead")
     
     # Create Flask app
-    app = create_app()
+    app = create_app(args.config)
     
     # Launch browser in background thread
-    browser_thread = threading.Thread(
-        target=launch_browser,
-        args=(port,),
-        daemon=True
-    )
-    browser_thread.start()
+    if not args.no_browser:
+        browser_thread = threading.Thread(
+            target=launch_browser,
+            args=(port,),
+            daemon=True
+        )
+        browser_thread.start()
     
     # Print startup message
     print("╔═══════════════════════════════════════════════════════╗")
@@ -75,7 +135,7 @@ def main():
     # Run the Flask app
     try:
         app.run(
-            host='127.0.0.1',
+            host=args.host,
             port=port,
             debug=False,
             use_reloader=False,
@@ -4,6 +4,8 @@ NexDex - Cross-System Business Impact Simulator
 Main CLI interface
 """
 import argparse
+import heapq
+import os
 import sys
 import json
 import webbrowser
@@ -35,9 +37,16 @@ except ImportError:
 from tabulate import tabulate
 
 from src.dependency_manager import DependencyManager
-from src.simulation_engine import SimulationEngine
+from src.simulation_engine import BatchStats, SimulationEngine
 from src.report_generator import ReportGenerator
 from src.models import Scenario
+from src.config_diff import diff_configs, compute_impact_deltas
+from src.scenario_store import ScenarioStore
+from src.scenario_catalog import get_catalog
+from src.scenario_pack import ResultStreamWriter, is_scenario_pack, iter_scenario_pack
+
+# SQLite scenario store, used instead of scenarios/*.json when configured
+scenario_store = None
 
 
 def print_colored(text: str, color=Fore.WHITE, bright=False):
@@ -122,7 +131,9 @@ def run_simulation(
     save_scenario: str = None,
     show_ascii_graph: bool = False,
     open_report: bool = False,
-    peak_hours: bool = False
+    peak_hours: bool = False,
+    ascii_hops: int = None,
+    graph_context: int = None
 ):
     """Run a failure simulation"""
     peak_label = " (PEAK HOURS 🔴)" if peak_hours else ""
@@ -194,14 +205,14 @@ def run_simulation(
         print(tabulate(proc_table, headers=["Process", "Total Impact Score"], tablefmt="grid"))
 
     if show_ascii_graph:
-        print_ascii_graph(dependency_manager, failed_services, result)
+        print_ascii_graph(dependency_manager, failed_services, result, hops=ascii_hops)
     
     reports = None
 
     # Generate reports
     if generate_reports:
         print_colored(f"\n📄 Generating Reports...", Fore.CYAN)
-        report_gen = ReportGenerator()
+        report_gen = ReportGenerator(graph_context=graph_context)
         reports = report_gen.generate_all_reports(result, dependency_manager)
         
         print_colored("✅ Reports generated:", Fore.GREEN)
@@ -234,62 +245,77 @@ def save_scenario_to_file(failed_services: List[str], scenario_name: str):
         failed_services=failed_services
     )
     
+    if scenario_store is not None:
+        scenario_store.save(scenario)
+        return
+    
     filepath = scenarios_dir / f"{scenario_name}.json"
     with open(filepath, 'w') as f:
         json.dump(scenario.to_dict(), f, indent=2)
 
 
 def load_scenario_from_file(scenario_name: str) -> Scenario:
-    """Load a scenario from file"""
-    scenarios_dir = Path("scenarios")
-    filepath = scenarios_dir / f"{scenario_name}.json"
+    """Load a scenario from file (or the scenario store when configured)"""
+    if scenario_store is not None:
+        scenario = scenario_store.get(scenario_name)
+        if scenario is None:
+            raise FileNotFoundError(f"Scenario '{scenario_name}' not found")
+        return scenario
     
-    if not filepath.exists():
-        raise FileNotFoundError(f"Scenario '{scenario_name}' not found")
+    return get_catalog("scenarios").get(scenario_name)
+
+
+def format_scenario_row(scenario: Scenario) -> list:
+    """Format a scenario as a row of the scenarios table"""
+    tags_str = ", ".join(scenario.tags) if scenario.tags else "(none)"
+    return [
+        scenario.name,
+        ", ".join(scenario.failed_services),
+        scenario.created_at.strftime("%Y-%m-%d %H:%M"),
+        tags_str,
+        scenario.description[:40] + ("..." if len(scenario.description) > 40 else "")
+    ]
+
+
+def list_stored_scenarios(filter_tag: str = None, page: int = 1, page_size: int = 50):
+    """List one page of scenarios from the scenario store, filtering by tag in SQL"""
+    total = scenario_store.count(tag=filter_tag)
+    if total == 0:
+        tag_msg = f" with tag '{filter_tag}'" if filter_tag else ""
+        print_colored(f"No scenarios found{tag_msg}.", Fore.YELLOW)
+        return
     
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+    page = max(1, page)
+    scenarios = scenario_store.list(tag=filter_tag, limit=page_size, offset=(page - 1) * page_size)
+    pages = (total + page_size - 1) // page_size
     
-    return Scenario.from_dict(data)
+    print_colored(f"\n💾 Saved Scenarios (page {page}/{pages}, {total} total):\n", Fore.CYAN, bright=True)
+    headers = ["Name", "Failed Services", "Created", "Tags", "Description"]
+    print(tabulate([format_scenario_row(s) for s in scenarios], headers=headers, tablefmt="grid"))
 
 
-def list_scenarios(filter_tag: str = None):
+def list_scenarios(filter_tag: str = None, page: int = 1, page_size: int = 50):
     """List all saved scenarios, optionally filtered by tag"""
-    scenarios_dir = Path("scenarios")
-    
-    if not scenarios_dir.exists():
-        print_colored("No scenarios saved yet.", Fore.YELLOW)
+    if scenario_store is not None:
+        list_stored_scenarios(filter_tag, page, page_size)
         return
     
-    scenario_files = list(scenarios_dir.glob("*.json"))
+    scenarios, errors = get_catalog("scenarios").scan()
+    for filename, error in errors:
+        print_colored(f"Error loading {filename}: {error}", Fore.RED)
     
-    if not scenario_files:
+    if not scenarios and not errors:
         print_colored("No scenarios saved yet.", Fore.YELLOW)
         return
     
     print_colored("\n💾 Saved Scenarios:\n", Fore.CYAN, bright=True)
     
     table_data = []
-    for filepath in sorted(scenario_files):
-        try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            scenario = Scenario.from_dict(data)
-            
-            # Filter by tag if specified
-            if filter_tag and filter_tag.lower() not in [t.lower() for t in scenario.tags]:
-                continue
-            
-            tags_str = ", ".join(scenario.tags) if scenario.tags else "(none)"
-            table_data.append([
-                scenario.name,
-                ", ".join(scenario.failed_services),
-                scenario.created_at.strftime("%Y-%m-%d %H:%M"),
-                tags_str,
-                scenario.description[:40] + ("..." if len(scenario.description) > 40 else "")
-            ])
-        except Exception as e:
-            print_colored(f"Error loading {filepath.name}: {e}", Fore.RED)
+    for scenario in scenarios:
+        # Filter by tag if specified
+        if filter_tag and filter_tag.lower() not in [t.lower() for t in scenario.tags]:
+            continue
+        table_data.append(format_scenario_row(scenario))
     
     if not table_data:
         tag_msg = f" with tag '{filter_tag}'" if filter_tag else ""
@@ -323,13 +349,75 @@ def validate_config(dependency_manager: DependencyManager):
         print_colored("✅ No circular dependencies found.", Fore.GREEN)
 
 
+def diff_config(dependency_manager: DependencyManager, new_config: str):
+    """Show structural differences to another config and the impact delta of saved scenarios"""
+    new_manager = DependencyManager()
+    try:
+        new_manager.load_config(new_config)
+    except Exception as e:
+        print_colored(f"❌ Error loading configuration {new_config}: {e}", Fore.RED)
+        return
+    
+    diff = diff_configs(dependency_manager, new_manager)
+    print_colored(f"\n🔀 Config Diff against {new_config}:\n", Fore.CYAN, bright=True)
+    
+    if diff.is_empty():
+        print_colored("✅ No differences that affect simulations.", Fore.GREEN)
+        return
+    
+    for name in diff.added_services:
+        print_colored(f"  + service {name}", Fore.GREEN)
+    for name in diff.removed_services:
+        print_colored(f"  - service {name}", Fore.RED)
+    for src, dst in diff.added_edges:
+        print_colored(f"  + edge {src} -> {dst}", Fore.GREEN)
+    for src, dst in diff.removed_edges:
+        print_colored(f"  - edge {src} -> {dst}", Fore.RED)
+    for change in diff.changed_services:
+        print_colored(f"  ~ {change.service}.{change.field}: {change.old} -> {change.new}", Fore.YELLOW)
+    for process, (old, new) in diff.changed_processes.items():
+        print_colored(f"  ~ process '{process}': {old} -> {new}", Fore.YELLOW)
+    
+    if scenario_store is not None:
+        scenarios = scenario_store.list()
+    else:
+        scenarios, errors = get_catalog("scenarios").scan()
+        for filename, error in errors:
+            print_colored(f"Error loading {filename}: {error}", Fore.RED)
+    
+    if not scenarios:
+        return
+    
+    deltas = compute_impact_deltas(
+        SimulationEngine(dependency_manager),
+        SimulationEngine(new_manager),
+        scenarios,
+        diff=diff
+    )
+    
+    table_data = []
+    for delta in sorted(deltas, key=lambda d: abs(d.delta or 0), reverse=True):
+        table_data.append([
+            delta.scenario,
+            f"{delta.old_total:.2f}" if delta.old_total is not None else "ERROR",
+            f"{delta.new_total:.2f}" if delta.new_total is not None else "ERROR",
+            f"{delta.delta:+.2f}" if delta.delta is not None else delta.error,
+            "yes" if delta.recomputed else "cached"
+        ])
+    
+    recomputed = sum(1 for d in deltas if d.recomputed)
+    print_colored(f"\n📈 Scenario Impact Delta ({recomputed}/{len(deltas)} re-simulated):\n", Fore.CYAN, bright=True)
+    headers = ["Scenario", "Old Impact", "New Impact", "Delta", "Re-simulated"]
+    print(tabulate(table_data, headers=headers, tablefmt="grid"))
+
+
 def resolve_scenario_paths(patterns: List[str]) -> List[Path]:
     """Resolve scenario file paths from patterns and globs"""
     paths = []
     for pattern in patterns:
         if any(ch in pattern for ch in ["*", "?", "["]):
             for p in Path(".").glob(pattern):
-                if p.is_file() and p.suffix.lower() == ".json":
+                if p.is_file() and (p.suffix.lower() == ".json" or is_scenario_pack(p)):
                     paths.append(p)
         else:
             p = Path(pattern)
@@ -350,11 +438,63 @@ def resolve_scenario_paths(patterns: List[str]) -> List[Path]:
     return unique
 
 
+def run_scenario_packs(
+    dependency_manager: DependencyManager,
+    pack_paths: List[Path],
+    output_path: str = None,
+    include_impacts: bool = True
+):
+    """Stream scenario packs through the engine, writing results as JSON Lines"""
+    if output_path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = Path("reports") / f"batch_results_{timestamp}.jsonl"
+    
+    def scenarios():
+        for pack_path in pack_paths:
+            yield from iter_scenario_pack(pack_path)
+    
+    engine = SimulationEngine(dependency_manager)
+    stats = BatchStats()
+    total_impact = 0.0
+    worst = []  # min-heap of (impact, name), bounded to the top 5
+    
+    try:
+        with ResultStreamWriter(output_path, include_impacts=include_impacts) as writer:
+            for scenario, result, error in engine.iter_simulations(scenarios(), stats=stats):
+                writer.write(scenario, result, error)
+                if result is None:
+                    continue
+                total_impact += result.total_impact_score
+                entry = (result.total_impact_score, scenario.name)
+                if len(worst) < 5:
+                    heapq.heappush(worst, entry)
+                else:
+                    heapq.heappushpop(worst, entry)
+    except (OSError, ValueError) as e:
+        print_colored(f"❌ Failed to read scenario pack: {e}", Fore.RED)
+        return
+    
+    print_colored(f"\n✅ Streamed {writer.count} scenario(s) from {len(pack_paths)} pack(s)", Fore.GREEN, bright=True)
+    print(f"  Simulations run: {stats.simulated} (dedup ratio {stats.dedup_ratio:.2f}x)")
+    print(f"  Total Impact (sum): {total_impact:.2f}")
+    if stats.errors:
+        print_colored(f"  Scenarios with errors: {stats.errors}", Fore.YELLOW)
+    if worst:
+        print_colored("  Most severe scenarios:", Fore.CYAN)
+        for impact, name in sorted(worst, reverse=True):
+            print(f"    - {name}: {impact:.2f}")
+    print_colored(f"\n📄 Results written to: {output_path}", Fore.GREEN)
+
+
 def run_batch_scenarios(
     dependency_manager: DependencyManager,
     patterns: List[str],
     generate_reports: bool = True,
-    open_report: bool = False
+    open_report: bool = False,
+    output_path: str = None,
+    include_impacts: bool = True,
+    scenario_reports: bool = False,
+    graph_context: int = None
 ):
     """Run multiple scenarios and generate a combined report"""
     scenario_paths = resolve_scenario_paths(patterns)
@@ -362,6 +502,13 @@ def run_batch_scenarios(
         print_colored("❌ No scenario files found for batch run.", Fore.RED)
         return
     
+    pack_paths = [p for p in scenario_paths if is_scenario_pack(p)]
+    if pack_paths:
+        run_scenario_packs(dependency_manager, pack_paths, output_path, include_impacts)
+        scenario_paths = [p for p in scenario_paths if not is_scenario_pack(p)]
+        if not scenario_paths:
+            return
+    
     scenarios = []
     for path in scenario_paths:
         try:
@@ -373,20 +520,43 @@ def run_batch_scenarios(
             return
     
     engine = SimulationEngine(dependency_manager)
+    stats = BatchStats()
+    completed = []
     results = []
-    for scenario in scenarios:
-        result = engine.simulate_failure(scenario.failed_services, peak_hours=scenario.peak_hours)
+    for scenario, result, error in engine.iter_simulations(scenarios, stats=stats, cache_size=len(scenarios)):
+        if result is None:
+            print_colored(f"❌ {scenario.name}: {error}", Fore.RED)
+            continue
+        completed.append(scenario)
         results.append(result)
     
     print_colored("\n✅ Batch simulation complete", Fore.GREEN, bright=True)
-    for scenario, result in zip(scenarios, results):
+    for scenario, result in zip(completed, results):
         print_colored(f"  - {scenario.name}: {result.total_impact_score:.2f} total impact", Fore.CYAN)
+    print(f"  {stats.scenarios} scenario(s), {stats.simulated} distinct failure set(s) "
+          f"(dedup ratio {stats.dedup_ratio:.2f}x)")
     
-    if generate_reports:
-        report_gen = ReportGenerator()
-        batch_report = report_gen.generate_batch_markdown_report(scenarios, results)
+    if generate_reports and results:
+        report_gen = ReportGenerator(graph_context=graph_context)
+        batch_report = report_gen.generate_batch_markdown_report(completed, results, stats=stats)
         print_colored("\n📄 Batch report generated:", Fore.GREEN)
         print(f"  - MARKDOWN: {batch_report}")
+        
+        if scenario_reports:
+            # Graph images render in worker processes while the next scenarios' text reports are written
+            items = (
+                (f"{scenario_report_prefix(scenario.name)}_{index}", result)
+                for index, (scenario, result) in enumerate(zip(completed, results), 1)
+            )
+            print_colored("\n📄 Scenario reports:", Fore.GREEN)
+            for prefix, reports in report_gen.generate_reports_batch(items, dependency_manager):
+                print(f"  - {prefix}: {reports['html']}")
+
+
+def scenario_report_prefix(name: str) -> str:
+    """File name prefix for a scenario's reports"""
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+    return f"scenario_{safe or 'unnamed'}"
 
 
 def interactive_shell(dependency_manager: DependencyManager):
@@ -539,9 +709,10 @@ def apply_process_importance_overrides(
 def print_ascii_graph(
     dependency_manager: DependencyManager,
     failed_services: List[str],
-    result
+    result,
+    hops: int = None
 ):
-    """Print a simple ASCII dependency view with statuses"""
+    """Print a simple ASCII dependency view with statuses (optionally only within `hops` of a failure)"""
     try:
         import networkx as nx
     except Exception:
@@ -551,6 +722,14 @@ def print_ascii_graph(
     failed_set = set(failed_services)
     affected_set = {i.service.name for i in result.impacts if not i.is_direct_failure}
     graph = dependency_manager.graph
+    
+    if hops is not None:
+        nearby = set()
+        for service_name in failed_set:
+            neighborhood = dependency_manager.get_neighborhood(service_name, hops=hops)
+            if neighborhood is not None:
+                nearby |= neighborhood.services
+        graph = graph.subgraph(nearby)
 
     try:
         ordered = list(nx.topological_sort(graph))
@@ -692,13 +871,25 @@ Examples:
   python nexdex.py --fail Database --save critical_db_failure
   python nexdex.py --load critical_db_failure
   python nexdex.py --config custom.json --fail API
+  python nexdex.py --config "config/teams/*.json" --list
+  python nexdex.py --diff-config proposed_services.json
+  python nexdex.py --batch nightly_chaos.jsonl --batch-output results.jsonl
+  python nexdex.py --scenario-db scenarios.db --import-scenarios scenarios/
+  python nexdex.py --scenario-db scenarios.db --scenarios --filter-tags critical
         """
     )
     
     parser.add_argument(
         "--config",
         default="config/services.json",
-        help="Path to services configuration file (default: config/services.json)"
+        help="Path to services configuration file, directory of fragments or glob (default: config/services.json)"
+    )
+    
+    parser.add_argument(
+        "--config-workers",
+        type=int,
+        metavar="N",
+        help="Worker processes used to parse config fragments (default: one per CPU)"
     )
     
     parser.add_argument(
@@ -744,6 +935,20 @@ Examples:
         help="Show ASCII dependency view in CLI"
     )
 
+    parser.add_argument(
+        "--ascii-hops",
+        type=int,
+        metavar="N",
+        help="Limit the ASCII view to services within N hops of a failure"
+    )
+    parser.add_argument(
+        "--graph-context",
+        type=int,
+        metavar="N",
+        help="Draw only impacted services and those within N hops in the graph report "
+             "(default: automatic for graphs over 100 services)"
+    )
+
     parser.add_argument(
         "--set-process-importance",
         nargs="+",
@@ -755,7 +960,25 @@ Examples:
         "--batch",
         nargs="+",
         metavar="PATH",
-        help="Run multiple scenarios (supports globs like scenarios/*.json)"
+        help="Run multiple scenarios (supports globs like scenarios/*.json and .jsonl scenario packs)"
+    )
+
+    parser.add_argument(
+        "--batch-output",
+        metavar="PATH",
+        help="JSON Lines file for streamed scenario pack results (default: reports/batch_results_<timestamp>.jsonl)"
+    )
+
+    parser.add_argument(
+        "--scenario-reports",
+        action="store_true",
+        help="With --batch, also generate full reports (Markdown, HTML, graph) for every scenario"
+    )
+
+    parser.add_argument(
+        "--compact-results",
+        action="store_true",
+        help="Omit per-service impacts from streamed scenario pack results"
     )
 
     parser.add_argument(
@@ -776,6 +999,34 @@ Examples:
         help="Filter scenarios by tag (use with --scenarios)"
     )
 
+    parser.add_argument(
+        "--page",
+        type=int,
+        default=1,
+        help="Page of scenarios to list when using --scenario-db (default: 1)"
+    )
+
+    parser.add_argument(
+        "--scenario-db",
+        metavar="PATH",
+        default=os.environ.get("NEXDEX_SCENARIO_DB"),
+        help="Use a SQLite scenario store instead of scenarios/*.json (env: NEXDEX_SCENARIO_DB)"
+    )
+
+    parser.add_argument(
+        "--import-scenarios",
+        nargs="?",
+        const="scenarios",
+        metavar="DIR",
+        help="Import scenario JSON files into the scenario store (default: scenarios/)"
+    )
+
+    parser.add_argument(
+        "--export-scenarios",
+        metavar="DIR",
+        help="Export the scenario store as JSON files"
+    )
+
     parser.add_argument(
         "--compare",
         nargs=2,
@@ -783,6 +1034,12 @@ Examples:
         help="Compare two scenarios side-by-side (e.g., --compare scenario1 scenario2)"
     )
     
+    parser.add_argument(
+        "--diff-config",
+        metavar="NEW_CONFIG",
+        help="Diff against another config and show how saved scenarios' impact changes"
+    )
+    
     parser.add_argument(
         "--validate",
         action="store_true",
@@ -800,10 +1057,26 @@ Examples:
     # Print banner
     print_banner()
     
+    global scenario_store
+    if args.scenario_db or args.import_scenarios or args.export_scenarios:
+        scenario_store = ScenarioStore(args.scenario_db or "scenarios/scenarios.db")
+    
+    if args.import_scenarios:
+        imported, errors = scenario_store.import_directory(args.import_scenarios)
+        for error in errors:
+            print_colored(f"Error loading {error}", Fore.RED)
+        print_colored(f"✅ Imported {imported} scenario(s) into {scenario_store.db_path}", Fore.GREEN)
+        return
+    
+    if args.export_scenarios:
+        exported = scenario_store.export_directory(args.export_scenarios)
+        print_colored(f"✅ Exported {exported} scenario(s) to {args.export_scenarios}", Fore.GREEN)
+        return
+    
     # Load configuration
     try:
         dependency_manager = DependencyManager()
-        dependency_manager.load_from_json(args.config)
+        dependency_manager.load_config(args.config, max_workers=args.config_workers)
         print_colored(f"✅ Loaded configuration from: {args.config}", Fore.GREEN)
     except FileNotFoundError:
         print_colored(f"❌ Configuration file not found: {args.config}", Fore.RED)
@@ -825,18 +1098,24 @@ Examples:
     # Handle commands
     if args.validate:
         validate_config(dependency_manager)
+    elif args.diff_config:
+        diff_config(dependency_manager, args.diff_config)
     elif args.interactive:
         interactive_shell(dependency_manager)
     elif args.list:
         list_services(dependency_manager)
     elif args.scenarios:
-        list_scenarios(filter_tag=args.filter_tags)
+        list_scenarios(filter_tag=args.filter_tags, page=args.page)
     elif args.batch:
         run_batch_scenarios(
             dependency_manager,
             args.batch,
             generate_reports=not args.no_reports,
-            open_report=args.open_report
+            open_report=args.open_report,
+            output_path=args.batch_output,
+            include_impacts=not args.compact_results,
+            scenario_reports=args.scenario_reports,
+            graph_context=args.graph_context
         )
     elif args.load:
         try:
@@ -849,7 +1128,9 @@ Examples:
                 generate_reports=not args.no_reports,
                 show_ascii_graph=args.ascii_graph,
                 open_report=args.open_report,
-                peak_hours=scenario.peak_hours
+                peak_hours=scenario.peak_hours,
+                ascii_hops=args.ascii_hops,
+                graph_context=args.graph_context
             )
         except FileNotFoundError as e:
             print_colored(f"❌ {e}", Fore.RED)
@@ -869,7 +1150,9 @@ Examples:
             generate_reports=not args.no_reports,
             save_scenario=args.save,
             show_ascii_graph=args.ascii_graph,
-            open_report=args.open_report
+            open_report=args.open_report,
+            ascii_hops=args.ascii_hops,
+            graph_context=args.graph_context
         )
     else:
         parser.print_help()
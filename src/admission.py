@@ -0,0 +1,154 @@
+"""
+Admission control for expensive request handlers
+"""
+import heapq
+import itertools
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Lower value is admitted first
+PRIORITY_HIGH = 0  # Cheap work, e.g. one simulation whose response will be cached
+PRIORITY_LOW = 1  # Heavy work: comparisons, batches, streams
+
+REJECTED_QUEUE_FULL = "queue_full"
+REJECTED_TIMEOUT = "timeout"
+REJECTED_DISPLACED = "displaced"
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted; carries the HTTP status and Retry-After seconds"""
+
+    def __init__(self, reason: str, status: int, retry_after: int):
+        super().__init__(f"Server busy ({reason.replace('_', ' ')}); retry in {retry_after}s")
+        self.reason = reason
+        self.status = status
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ('priority', 'event', 'granted', 'rejected')
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.event = threading.Event()
+        self.granted = False
+        self.rejected: Optional[str] = None
+
+
+class Admission:
+    """A held slot; release it (or leave the with-block) when the work is done"""
+
+    def __init__(self, controller: 'AdmissionController'):
+        self._controller = controller
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        """Give the slot to the next waiter (safe to call more than once)"""
+        if not self._released:
+            self._released = True
+            self._controller._release(time.monotonic() - self._started)
+
+    def __enter__(self) -> 'Admission':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+class AdmissionController:
+    """
+    Bounds how many expensive requests run at once
+
+    Up to `max_concurrent` requests hold a slot; up to `max_queue` more wait
+    for one, highest priority first, for at most `queue_timeout` seconds.
+    A request arriving at a full queue is rejected at once (429), unless it
+    outranks a waiter, which is then displaced instead. A request that waits
+    out its deadline is rejected with 503. Rejections carry a Retry-After
+    estimated from recent slot hold times.
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 16, queue_timeout: float = 2.0):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {
+            REJECTED_QUEUE_FULL: 0, REJECTED_TIMEOUT: 0, REJECTED_DISPLACED: 0
+        }
+        self._hold_seconds = 0.1  # Moving average of how long a slot is held
+        self._waiters: List = []  # Heap of (priority, sequence, waiter); granted/rejected ones are skipped
+        self._queued = 0
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def queued(self) -> int:
+        """Requests currently waiting for a slot"""
+        return self._queued
+
+    def acquire(self, priority: int = PRIORITY_LOW) -> Admission:
+        """Wait for a slot, raising AdmissionRejected when busy"""
+        with self._lock:
+            if self.active < self.max_concurrent and self._queued == 0:
+                self.active += 1
+                self.admitted += 1
+                return Admission(self)
+            if self._queued >= self.max_queue and not self._displace(priority):
+                raise self._reject(REJECTED_QUEUE_FULL, 429)
+            waiter = _Waiter(priority)
+            heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+            self._queued += 1
+
+        waiter.event.wait(self.queue_timeout)
+
+        with self._lock:
+            if waiter.granted:
+                self.admitted += 1
+                return Admission(self)
+            if waiter.rejected is None:
+                waiter.rejected = REJECTED_TIMEOUT
+                self._queued -= 1
+            raise self._reject(waiter.rejected, 503)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait before retrying"""
+        backlog = self._queued + self.active + 1
+        return max(1, math.ceil(self._hold_seconds * backlog / self.max_concurrent))
+
+    def _displace(self, priority: int) -> bool:
+        """Reject the lowest-priority, newest waiter if it ranks below `priority` (caller holds the lock)"""
+        victim = None
+        for entry in self._waiters:
+            waiter = entry[2]
+            if waiter.granted or waiter.rejected is not None:
+                continue
+            if victim is None or (entry[0], entry[1]) > (victim[0], victim[1]):
+                victim = entry
+        if victim is None or victim[0] <= priority:
+            return False
+        victim[2].rejected = REJECTED_DISPLACED
+        victim[2].event.set()
+        self._queued -= 1
+        return True
+
+    def _reject(self, reason: str, status: int) -> AdmissionRejected:
+        self.rejected[reason] += 1
+        return AdmissionRejected(reason, status, self.retry_after())
+
+    def _release(self, held: float) -> None:
+        with self._lock:
+            self._hold_seconds += 0.2 * (held - self._hold_seconds)
+            while self._waiters:
+                _, _, waiter = heapq.heappop(self._waiters)
+                if waiter.rejected is not None:
+                    continue
+                # Hand the slot over directly; `active` stays the same
+                waiter.granted = True
+                self._queued -= 1
+                waiter.event.set()
+                return
+            self.active -= 1
@@ -0,0 +1,235 @@
+"""
+Structural diff between two configurations and incremental impact deltas
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .models import Scenario, SimulationResult
+from .dependency_manager import DependencyManager
+from .simulation_engine import SimulationEngine
+
+# Service fields that change impact scores
+DIFFED_FIELDS = ("mttr", "importance", "business_process")
+
+
+@dataclass
+class ServiceChange:
+    """A changed field on a service present in both configurations"""
+    service: str
+    field: str
+    old: Any
+    new: Any
+
+    def to_dict(self) -> Dict:
+        """Convert change to dictionary"""
+        return {"service": self.service, "field": self.field, "old": self.old, "new": self.new}
+
+
+@dataclass
+class ConfigDiff:
+    """Differences between an old and a new configuration"""
+    added_services: List[str] = field(default_factory=list)
+    removed_services: List[str] = field(default_factory=list)
+    added_edges: List[Tuple[str, str]] = field(default_factory=list)
+    removed_edges: List[Tuple[str, str]] = field(default_factory=list)
+    changed_services: List[ServiceChange] = field(default_factory=list)
+    changed_processes: Dict[str, Tuple[Optional[int], Optional[int]]] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        """Whether the two configurations are equivalent for simulation"""
+        return not (
+            self.added_services or self.removed_services or self.added_edges
+            or self.removed_edges or self.changed_services or self.changed_processes
+        )
+
+    def touches(self, affected: Set[str], processes: Set[str]) -> bool:
+        """
+        Whether a simulation over `affected` services could change
+
+        An edge only matters when its source (the dependency) is affected:
+        that changes the source's dependent count and what the cascade reaches.
+        """
+        if any(name in affected for name in self.removed_services):
+            return True
+        if any(change.service in affected for change in self.changed_services):
+            return True
+        if any(src in affected for src, _ in self.added_edges):
+            return True
+        if any(src in affected for src, _ in self.removed_edges):
+            return True
+        return any(process in processes for process in self.changed_processes)
+
+    def to_dict(self) -> Dict:
+        """Convert diff to dictionary"""
+        return {
+            "added_services": self.added_services,
+            "removed_services": self.removed_services,
+            "added_edges": [list(e) for e in self.added_edges],
+            "removed_edges": [list(e) for e in self.removed_edges],
+            "changed_services": [c.to_dict() for c in self.changed_services],
+            "changed_processes": {k: list(v) for k, v in self.changed_processes.items()}
+        }
+
+
+@dataclass
+class ImpactDelta:
+    """Change in a scenario's impact between two configurations"""
+    scenario: str
+    old_total: Optional[float]
+    new_total: Optional[float]
+    old_services_affected: Optional[int]
+    new_services_affected: Optional[int]
+    recomputed: bool
+    error: Optional[str] = None
+
+    @property
+    def delta(self) -> Optional[float]:
+        """New minus old total impact (None if either simulation failed)"""
+        if self.old_total is None or self.new_total is None:
+            return None
+        return self.new_total - self.old_total
+
+    def to_dict(self) -> Dict:
+        """Convert delta to dictionary"""
+        return {
+            "scenario": self.scenario,
+            "old_total": self.old_total,
+            "new_total": self.new_total,
+            "delta": self.delta,
+            "old_services_affected": self.old_services_affected,
+            "new_services_affected": self.new_services_affected,
+            "recomputed": self.recomputed,
+            "error": self.error
+        }
+
+
+def diff_configs(old: DependencyManager, new: DependencyManager) -> ConfigDiff:
+    """Compute the structural diff between two dependency managers"""
+    diff = ConfigDiff()
+
+    old_names = set(old.services)
+    new_names = set(new.services)
+    diff.added_services = sorted(new_names - old_names)
+    diff.removed_services = sorted(old_names - new_names)
+
+    old_edges = set(old.graph.edges())
+    new_edges = set(new.graph.edges())
+    diff.added_edges = sorted(new_edges - old_edges)
+    diff.removed_edges = sorted(old_edges - new_edges)
+
+    for name in sorted(old_names & new_names):
+        old_service = old.services[name]
+        new_service = new.services[name]
+        for field_name in DIFFED_FIELDS:
+            old_value = getattr(old_service, field_name)
+            new_value = getattr(new_service, field_name)
+            if old_value != new_value:
+                diff.changed_services.append(ServiceChange(name, field_name, old_value, new_value))
+
+    old_processes = old.business_process_importance
+    new_processes = new.business_process_importance
+    for process in sorted(set(old_processes) | set(new_processes)):
+        old_value = old_processes.get(process)
+        new_value = new_processes.get(process)
+        if old_value != new_value:
+            diff.changed_processes[process] = (old_value, new_value)
+
+    return diff
+
+
+def _scenario_key(scenario: Scenario) -> Tuple[Tuple[str, ...], bool]:
+    return tuple(scenario.failed_services), bool(scenario.peak_hours)
+
+
+def compute_impact_deltas(
+    old_engine: SimulationEngine,
+    new_engine: SimulationEngine,
+    scenarios: List[Scenario],
+    diff: Optional[ConfigDiff] = None,
+    baseline_cache: Optional[Dict[Tuple[Tuple[str, ...], bool], SimulationResult]] = None
+) -> List[ImpactDelta]:
+    """
+    Compute how each scenario's impact changes between two configurations
+
+    Only scenarios whose affected subgraph in the old configuration touches
+    the diff are re-simulated against the new one; the rest reuse the old
+    result. Old results are read from and stored in `baseline_cache`.
+    """
+    old_manager = old_engine.dependency_manager
+    new_manager = new_engine.dependency_manager
+    if diff is None:
+        diff = diff_configs(old_manager, new_manager)
+    if baseline_cache is None:
+        baseline_cache = {}
+
+    deltas = []
+    for scenario in scenarios:
+        key = _scenario_key(scenario)
+        old_result = baseline_cache.get(key)
+        if old_result is None:
+            try:
+                old_result = old_engine.simulate_failure(scenario.failed_services, peak_hours=scenario.peak_hours)
+            except ValueError as e:
+                # E.g. a saved scenario naming a service the current config no longer has
+                deltas.append(_old_side_error(new_engine, scenario, str(e)))
+                continue
+            baseline_cache[key] = old_result
+
+        affected = {impact.service.name for impact in old_result.impacts}
+        processes = {
+            impact.service.business_process for impact in old_result.impacts
+            if impact.service.business_process
+        }
+
+        if not diff.touches(affected, processes):
+            deltas.append(ImpactDelta(
+                scenario=scenario.name,
+                old_total=old_result.total_impact_score,
+                new_total=old_result.total_impact_score,
+                old_services_affected=old_result.total_services_affected,
+                new_services_affected=old_result.total_services_affected,
+                recomputed=False
+            ))
+            continue
+
+        try:
+            new_result = new_engine.simulate_failure(scenario.failed_services, peak_hours=scenario.peak_hours)
+        except ValueError as e:
+            deltas.append(ImpactDelta(
+                scenario=scenario.name,
+                old_total=old_result.total_impact_score,
+                new_total=None,
+                old_services_affected=old_result.total_services_affected,
+                new_services_affected=None,
+                recomputed=True,
+                error=str(e)
+            ))
+            continue
+
+        deltas.append(ImpactDelta(
+            scenario=scenario.name,
+            old_total=old_result.total_impact_score,
+            new_total=new_result.total_impact_score,
+            old_services_affected=old_result.total_services_affected,
+            new_services_affected=new_result.total_services_affected,
+            recomputed=True
+        ))
+
+    return deltas
+
+
+def _old_side_error(new_engine: SimulationEngine, scenario: Scenario, error: str) -> ImpactDelta:
+    """Delta for a scenario the old configuration can't simulate; the new side is still reported if it can"""
+    try:
+        new_result = new_engine.simulate_failure(scenario.failed_services, peak_hours=scenario.peak_hours)
+    except ValueError:
+        new_result = None
+    return ImpactDelta(
+        scenario=scenario.name,
+        old_total=None,
+        new_total=new_result.total_impact_score if new_result else None,
+        old_services_affected=None,
+        new_services_affected=new_result.total_services_affected if new_result else None,
+        recomputed=True,
+        error=error
+    )
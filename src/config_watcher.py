@@ -0,0 +1,94 @@
+"""
+Background watcher that detects changes to service configuration files
+"""
+import hashlib
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+from .dependency_manager import resolve_config_paths
+
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+
+def config_fingerprint(source: str) -> Optional[Fingerprint]:
+    """
+    Fingerprint a config file, directory or glob by path, mtime and size
+
+    Returns None while the config is missing (e.g. mid-save by an editor
+    that writes a temp file and renames it).
+    """
+    try:
+        paths = resolve_config_paths(str(source))
+        fingerprint = []
+        for path in paths:
+            stat = os.stat(path)
+            fingerprint.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+    except (FileNotFoundError, OSError):
+        return None
+
+
+def config_digest(source: str) -> str:
+    """Hash the content of a config file, directory or glob (stable across restarts)"""
+    digest = hashlib.sha256()
+    for path in resolve_config_paths(str(source)):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(b"\0")
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ConfigWatcher:
+    """Polls a config source and calls `on_change` from a background thread"""
+
+    def __init__(
+        self,
+        source: str,
+        on_change: Callable[[str], None],
+        interval: float = 2.0,
+        initial: Optional[Fingerprint] = None
+    ):
+        self.source = str(source)
+        self.on_change = on_change
+        self.interval = interval
+        self._fingerprint = initial if initial is not None else config_fingerprint(self.source)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start polling in a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="nexdex-config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def check(self) -> bool:
+        """Check once for a change, calling `on_change` if found"""
+        fingerprint = config_fingerprint(self.source)
+        if fingerprint is None or fingerprint == self._fingerprint:
+            return False
+
+        # Record the fingerprint even on failure so a broken config is
+        # reported once and retried only after it is edited again
+        self._fingerprint = fingerprint
+        try:
+            self.on_change(self.source)
+        except Exception as e:
+            print(f"Error reloading configuration {self.source}: {e}")
+            return False
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
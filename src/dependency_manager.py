@@ -1,13 +1,191 @@
 """
 Dependency management and graph operations for NexDex
 """
+import glob
 import json
 import os
-from typing import Dict, List, Set, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Set, Optional, Tuple
 import networkx as nx
 from pathlib import Path
 
-from .models import Service
+from .models import Service, ServiceRecord
+
+CONFIG_GLOB_CHARS = ("*", "?", "[")
+NEIGHBORHOOD_DIRECTIONS = ("both", "upstream", "downstream")
+NEIGHBORHOOD_CACHE_SIZE = 256
+
+
+class ConfigConflictError(ValueError):
+    """Raised when config fragments disagree about a service or business process"""
+
+    def __init__(self, conflicts: List[str]):
+        self.conflicts = conflicts
+        super().__init__("Conflicting configuration fragments:\n  - " + "\n  - ".join(conflicts))
+
+
+def resolve_config_paths(source: str) -> List[Path]:
+    """Resolve a config file, directory of fragments or glob into sorted file paths"""
+    if any(ch in source for ch in CONFIG_GLOB_CHARS):
+        paths = [Path(p) for p in glob.glob(source) if Path(p).is_file()]
+    else:
+        path = Path(source)
+        if path.is_dir():
+            paths = [p for p in path.glob("*.json") if p.is_file()]
+        elif path.exists():
+            paths = [path]
+        else:
+            raise FileNotFoundError(f"Configuration file not found: {path}")
+    
+    if not paths:
+        raise FileNotFoundError(f"No configuration files matched: {source}")
+    return sorted(paths)
+
+
+def _parse_config_fragment(filepath: str) -> Tuple[str, Dict[str, int], List[Dict]]:
+    """Parse one config fragment (runs in a worker process)"""
+    with open(filepath, 'r') as f:
+        data = json.load(f)
+    
+    processes = {k: int(v) for k, v in data.get("business_processes", {}).items()}
+    return filepath, processes, data.get("services", [])
+
+
+class CompiledGraph:
+    """
+    Immutable integer-indexed adjacency built from a DependencyManager
+    
+    Service ids are positions in `records`; `successors[i]` holds the ids of
+    services that depend on service i, `predecessors[i]` the ids it depends on.
+    """
+    __slots__ = ("records", "index", "successors", "predecessors", "dependent_names")
+    
+    def __init__(self, services: Dict[str, Service], graph: nx.DiGraph):
+        records = []
+        index: Dict[str, int] = {}
+        for service_id, service in enumerate(services.values()):
+            record = ServiceRecord.from_service(service, service_id)
+            records.append(record)
+            index[record.name] = service_id
+        
+        self.records = tuple(records)
+        self.index = index
+        self.successors = tuple(
+            tuple(index[s] for s in graph.successors(r.name)) for r in records
+        )
+        self.predecessors = tuple(
+            tuple(index[p] for p in graph.predecessors(r.name)) for r in records
+        )
+        self.dependent_names = tuple(
+            tuple(records[i].name for i in succ) for succ in self.successors
+        )
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def reachable(
+        self,
+        source_id: int,
+        max_depth: Optional[int] = None,
+        upstream: bool = False
+    ) -> Dict[int, int]:
+        """
+        Breadth-first search from a service along dependent edges
+        
+        Returns {service_id: cascade depth} for every service reachable from
+        the source, in discovery order. The source itself is only included
+        when a cycle leads back to it. `max_depth` limits the search to that
+        many hops; `upstream` follows dependencies instead of dependents.
+        """
+        adjacency = self.predecessors if upstream else self.successors
+        depths: Dict[int, int] = {}
+        frontier = [source_id]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for current in frontier:
+                for neighbor in adjacency[current]:
+                    if neighbor not in depths:
+                        depths[neighbor] = depth
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return depths
+    
+    def iter_cascade(self, source_ids) -> Iterator[Tuple[int, int]]:
+        """
+        Multi-source breadth-first search along dependent edges
+        
+        Yields (service_id, depth) with the sources first at depth 0, then
+        every reachable service in non-decreasing depth order. Each depth is
+        the shortest distance from any source, so it is final when yielded.
+        """
+        seen = set()
+        frontier = []
+        for source_id in source_ids:
+            if source_id not in seen:
+                seen.add(source_id)
+                frontier.append(source_id)
+                yield source_id, 0
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for current in frontier:
+                for neighbor in self.successors[current]:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        next_frontier.append(neighbor)
+                        yield neighbor, depth
+            frontier = next_frontier
+    
+    def induced_edges(self, service_ids) -> List[Tuple[str, str]]:
+        """Get (dependency, dependent) edges between the given services"""
+        members = set(service_ids)
+        records = self.records
+        return [
+            (records[src].name, records[dst].name)
+            for src in members
+            for dst in self.successors[src]
+            if dst in members
+        ]
+
+
+@dataclass(frozen=True)
+class Neighborhood:
+    """
+    k-hop ego graph around a service (shared from cache, treat as read-only)
+    
+    `upstream` maps dependencies and `downstream` maps dependents to their hop
+    distance from the center; `edges` are the (dependency, dependent) edges
+    between all member services.
+    """
+    center: str
+    hops: int
+    direction: str
+    upstream: Dict[str, int]
+    downstream: Dict[str, int]
+    edges: Tuple[Tuple[str, str], ...]
+    
+    @property
+    def services(self) -> Set[str]:
+        """All services in the neighborhood, including the center"""
+        return {self.center} | set(self.upstream) | set(self.downstream)
+    
+    def to_dict(self) -> Dict:
+        """Convert neighborhood to dictionary"""
+        return {
+            "center": self.center,
+            "hops": self.hops,
+            "direction": self.direction,
+            "upstream": self.upstream,
+            "downstream": self.downstream,
+            "services": sorted(self.services),
+            "edges": [list(e) for e in self.edges]
+        }
 
 
 class DependencyManager:
@@ -17,6 +195,30 @@ class DependencyManager:
         self.services: Dict[str, Service] = {}
         self.graph: nx.DiGraph = nx.DiGraph()
         self.business_process_importance: Dict[str, int] = {}
+        self.version = 0
+        self._compiled: Optional[CompiledGraph] = None
+        self._neighborhood_cache: "OrderedDict[Tuple[int, int, str], Neighborhood]" = OrderedDict()
+        self._graph_stats: Optional[Dict] = None
+        self.neighborhood_cache_hits = 0
+        self.neighborhood_cache_misses = 0
+        self._cache_lock = threading.Lock()
+    
+    def _invalidate(self, structural: bool = True) -> None:
+        """Bump the graph version after a mutation"""
+        self.version += 1
+        if structural:
+            self._compiled = None
+            self._graph_stats = None
+            with self._cache_lock:
+                self._neighborhood_cache.clear()
+    
+    def compile(self) -> CompiledGraph:
+        """Get the compiled integer adjacency for the current graph (cached per version)"""
+        compiled = self._compiled
+        if compiled is None:
+            compiled = CompiledGraph(self.services, self.graph)
+            self._compiled = compiled
+        return compiled
     
     def load_from_json(self, filepath: str) -> None:
         """Load service definitions from JSON file"""
@@ -32,6 +234,7 @@ class DependencyManager:
         self.services.clear()
         self.graph.clear()
         self.business_process_importance.clear()
+        self._invalidate()
         
         # Load business process importance
         self.business_process_importance = {
@@ -44,6 +247,76 @@ class DependencyManager:
             service = Service.from_dict(service_data)
             self.add_service(service)
     
+    def load_config(self, source: str, max_workers: Optional[int] = None) -> None:
+        """Load a single config file, a directory of fragments or a glob of fragments"""
+        paths = resolve_config_paths(str(source))
+        if len(paths) == 1 and Path(source).is_file():
+            self.load_from_json(str(paths[0]))
+        else:
+            self.load_from_fragments(paths, max_workers=max_workers)
+    
+    def load_from_fragments(self, filepaths: List[str], max_workers: Optional[int] = None) -> None:
+        """
+        Load and merge several config fragments into one graph
+        
+        Fragments are parsed in parallel worker processes and merged in path
+        order. A service defined in more than one fragment, or a business
+        process given different weights, raises ConfigConflictError.
+        """
+        filepaths = [str(p) for p in filepaths]
+        for filepath in filepaths:
+            if not Path(filepath).exists():
+                raise FileNotFoundError(f"Configuration file not found: {filepath}")
+        
+        if max_workers is None:
+            max_workers = min(len(filepaths), os.cpu_count() or 1)
+        
+        if max_workers <= 1 or len(filepaths) <= 1:
+            fragments = [_parse_config_fragment(p) for p in filepaths]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                fragments = list(executor.map(_parse_config_fragment, filepaths))
+        
+        # Merge with conflict detection
+        conflicts = []
+        processes: Dict[str, int] = {}
+        process_origin: Dict[str, str] = {}
+        service_origin: Dict[str, str] = {}
+        services_data: List[Dict] = []
+        
+        for filepath, fragment_processes, fragment_services in fragments:
+            for name, weight in fragment_processes.items():
+                if name in processes and processes[name] != weight:
+                    conflicts.append(
+                        f"Business process '{name}' has importance {processes[name]} "
+                        f"in {process_origin[name]} but {weight} in {filepath}"
+                    )
+                    continue
+                processes[name] = weight
+                process_origin.setdefault(name, filepath)
+            
+            for service_data in fragment_services:
+                name = service_data["name"]
+                if name in service_origin:
+                    conflicts.append(
+                        f"Service '{name}' is defined in both {service_origin[name]} and {filepath}"
+                    )
+                    continue
+                service_origin[name] = filepath
+                services_data.append(service_data)
+        
+        if conflicts:
+            raise ConfigConflictError(conflicts)
+        
+        # Clear existing data
+        self.services.clear()
+        self.graph.clear()
+        self.business_process_importance = processes
+        self._invalidate()
+        
+        for service_data in services_data:
+            self.add_service(Service.from_dict(service_data))
+    
     def save_to_json(self, filepath: str) -> None:
         """Save service definitions to JSON file"""
         data = {
@@ -72,6 +345,8 @@ class DependencyManager:
             
             # Edge from dependency to dependent service
             self.graph.add_edge(dependency, service.name)
+        
+        self._invalidate()
     
     def get_service(self, name: str) -> Optional[Service]:
         """Get a service by name"""
@@ -88,6 +363,7 @@ class DependencyManager:
     def set_process_importance(self, process_name: str, importance: int) -> None:
         """Set importance score for a business process"""
         self.business_process_importance[process_name] = int(importance)
+        self._invalidate(structural=False)
     
     def get_dependencies(self, service_name: str) -> List[str]:
         """Get direct dependencies of a service"""
@@ -103,20 +379,71 @@ class DependencyManager:
     
     def get_all_dependents(self, service_name: str) -> Set[str]:
         """Get all services affected by this service's failure (recursive)"""
-        if service_name not in self.graph:
+        compiled = self.compile()
+        service_id = compiled.index.get(service_name)
+        if service_id is None:
             return set()
         
-        affected = set()
-        to_check = [service_name]
+        records = compiled.records
+        return {records[i].name for i in compiled.reachable(service_id)}
+    
+    def get_neighborhood(self, service_name: str, hops: int = 1, direction: str = "both") -> Optional[Neighborhood]:
+        """
+        Get the k-hop ego graph around a service
+        
+        Args:
+            service_name: Center service
+            hops: Maximum number of hops from the center
+            direction: "upstream" (dependencies), "downstream" (dependents) or "both"
+            
+        Returns:
+            Neighborhood, or None if the service does not exist. Results are
+            kept in a bounded LRU cache until the graph changes.
+        """
+        if direction not in NEIGHBORHOOD_DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(NEIGHBORHOOD_DIRECTIONS)}")
+        if hops < 0:
+            raise ValueError("hops must be non-negative")
+        
+        compiled = self.compile()
+        service_id = compiled.index.get(service_name)
+        if service_id is None:
+            return None
+        
+        key = (service_id, hops, direction)
+        with self._cache_lock:
+            cached = self._neighborhood_cache.get(key)
+            if cached is not None:
+                self._neighborhood_cache.move_to_end(key)
+                self.neighborhood_cache_hits += 1
+                return cached
+            self.neighborhood_cache_misses += 1
         
-        while to_check:
-            current = to_check.pop()
-            for dependent in self.graph.successors(current):
-                if dependent not in affected:
-                    affected.add(dependent)
-                    to_check.append(dependent)
+        records = compiled.records
+        upstream_ids: Dict[int, int] = {}
+        downstream_ids: Dict[int, int] = {}
+        if direction in ("both", "upstream"):
+            upstream_ids = compiled.reachable(service_id, max_depth=hops, upstream=True)
+        if direction in ("both", "downstream"):
+            downstream_ids = compiled.reachable(service_id, max_depth=hops)
+        upstream_ids.pop(service_id, None)
+        downstream_ids.pop(service_id, None)
         
-        return affected
+        members = {service_id} | set(upstream_ids) | set(downstream_ids)
+        neighborhood = Neighborhood(
+            center=service_name,
+            hops=hops,
+            direction=direction,
+            upstream={records[i].name: d for i, d in upstream_ids.items()},
+            downstream={records[i].name: d for i, d in downstream_ids.items()},
+            edges=tuple(compiled.induced_edges(members))
+        )
+        
+        with self._cache_lock:
+            self._neighborhood_cache[key] = neighborhood
+            while len(self._neighborhood_cache) > NEIGHBORHOOD_CACHE_SIZE:
+                self._neighborhood_cache.popitem(last=False)
+        return neighborhood
     
     def get_cascade_path(self, from_service: str, to_service: str) -> Optional[List[str]]:
         """Get the shortest path from one service to another"""
@@ -130,10 +457,14 @@ class DependencyManager:
     
     def get_cascade_depth(self, from_service: str, to_service: str) -> int:
         """Get the depth of cascade from one service to another"""
-        path = self.get_cascade_path(from_service, to_service)
-        if path is None:
+        compiled = self.compile()
+        from_id = compiled.index.get(from_service)
+        to_id = compiled.index.get(to_service)
+        if from_id is None or to_id is None:
             return -1
-        return len(path) - 1
+        if from_id == to_id:
+            return 0
+        return compiled.reachable(from_id).get(to_id, -1)
     
     def detect_circular_dependencies(self) -> List[List[str]]:
         """Detect circular dependencies in the graph"""
@@ -145,10 +476,11 @@ class DependencyManager:
     
     def get_critical_services(self) -> List[tuple[str, int]]:
         """Get services sorted by number of dependents (most critical first)"""
-        criticality = []
-        for service_name in self.services:
-            dependent_count = len(self.get_all_dependents(service_name))
-            criticality.append((service_name, dependent_count))
+        compiled = self.compile()
+        criticality = [
+            (record.name, len(compiled.reachable(record.id)))
+            for record in compiled.records
+        ]
         
         return sorted(criticality, key=lambda x: x[1], reverse=True)
     
@@ -162,11 +494,19 @@ class DependencyManager:
         return errors
     
     def get_graph_stats(self) -> Dict:
-        """Get statistics about the dependency graph"""
-        return {
-            "total_services": len(self.services),
-            "total_dependencies": self.graph.number_of_edges(),
-            "circular_dependencies": len(self.detect_circular_dependencies()),
-            "isolated_services": len([n for n in self.graph.nodes() if self.graph.degree(n) == 0]),
-            "most_critical": self.get_critical_services()[:5] if self.services else []
-        }
+        """Get statistics about the dependency graph (computed once per graph structure)"""
+        stats = self._graph_stats
+        if stats is None:
+            compiled = self.compile()
+            stats = {
+                "total_services": len(self.services),
+                "total_dependencies": self.graph.number_of_edges(),
+                "circular_dependencies": len(self.detect_circular_dependencies()),
+                "isolated_services": sum(
+                    1 for succ, pred in zip(compiled.successors, compiled.predecessors)
+                    if not succ and not pred
+                ),
+                "most_critical": self.get_critical_services()[:5] if self.services else []
+            }
+            self._graph_stats = stats
+        return dict(stats)
@@ -0,0 +1,475 @@
+"""
+Graph layout computed once per graph structure and persisted between runs
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, FrozenSet, Hashable, Iterable, Optional, Tuple
+
+import networkx as nx
+
+from .dependency_manager import CONFIG_GLOB_CHARS, DependencyManager
+
+# Same parameters the reports have always used, so layouts look the same
+LAYOUT_K = 2
+LAYOUT_ITERATIONS = 50
+LAYOUT_SEED = 42
+
+# Above this share of changed nodes an incremental relayout is no cheaper
+# (and looks worse) than starting over
+INCREMENTAL_MAX_CHANGED = 0.5
+
+LAYOUT_DIR_NAME = ".nexdex-layout"
+LAYOUT_MAX_FILES = 64  # Layout files kept per LayoutCache directory
+
+Position = Tuple[float, float]
+
+
+def graph_structure_hash(graph: nx.DiGraph) -> str:
+    """Hash of a graph's nodes and edges (independent of insertion order)"""
+    digest = hashlib.sha256()
+    for node in sorted(graph.nodes()):
+        digest.update(node.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(b"\1")
+    for source, target in sorted(graph.edges()):
+        digest.update(f"{source}\0{target}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def layout_path_for(config_source: str) -> Path:
+    """
+    Where to persist the layout for a config file, directory or glob
+
+    A hidden directory beside the config, so fragment globs never pick the
+    layout file up as config.
+    """
+    source = str(config_source)
+    if any(ch in source for ch in CONFIG_GLOB_CHARS):
+        base = Path(os.path.dirname(source) or ".")
+        name = "fragments-" + hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+    else:
+        path = Path(source)
+        if path.is_dir():
+            base, name = path, "fragments"
+        else:
+            base, name = path.parent, path.stem
+    return base / LAYOUT_DIR_NAME / f"{name}.layout.json"
+
+
+@dataclass(frozen=True)
+class GraphLayout:
+    """Node coordinates for one graph structure"""
+    structure_hash: str
+    positions: Dict[str, Position]
+    edges: FrozenSet[Tuple[str, str]]
+    computed_at: datetime
+    relaid_out: int  # Nodes moved by the computation that produced this layout
+
+    def bounds(self) -> Dict[str, float]:
+        """Bounding box of the node coordinates"""
+        if not self.positions:
+            return {"min_x": 0.0, "max_x": 0.0, "min_y": 0.0, "max_y": 0.0}
+        xs = [p[0] for p in self.positions.values()]
+        ys = [p[1] for p in self.positions.values()]
+        return {"min_x": min(xs), "max_x": max(xs), "min_y": min(ys), "max_y": max(ys)}
+
+    def to_dict(self) -> Dict:
+        """Convert layout to the persisted dictionary format"""
+        return {
+            "structure_hash": self.structure_hash,
+            "parameters": {"k": LAYOUT_K, "iterations": LAYOUT_ITERATIONS, "seed": LAYOUT_SEED},
+            "computed_at": self.computed_at.isoformat(),
+            "positions": {name: list(pos) for name, pos in sorted(self.positions.items())},
+            "edges": sorted(list(edge) for edge in self.edges)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'GraphLayout':
+        """Create layout from the persisted dictionary format"""
+        parameters = data.get("parameters", {})
+        if parameters != {"k": LAYOUT_K, "iterations": LAYOUT_ITERATIONS, "seed": LAYOUT_SEED}:
+            raise ValueError("Layout was computed with different parameters")
+        return cls(
+            structure_hash=data["structure_hash"],
+            positions={name: (float(pos[0]), float(pos[1])) for name, pos in data["positions"].items()},
+            edges=frozenset((source, target) for source, target in data["edges"]),
+            computed_at=datetime.fromisoformat(data["computed_at"]),
+            relaid_out=0
+        )
+
+
+def load_layout(path: Path) -> Optional[GraphLayout]:
+    """Read a persisted layout (None if missing or unusable)"""
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r') as f:
+            return GraphLayout.from_dict(json.load(f))
+    except Exception as e:
+        print(f"Ignoring unreadable layout file {path}: {e}")
+        return None
+
+
+def save_layout(layout: GraphLayout, path: Path) -> None:
+    """Persist a layout atomically (readers never see a partial file)"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(layout.to_dict(), f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not save graph layout to {path}: {e}")
+
+
+def _round(pos) -> Position:
+    return round(float(pos[0]), 6), round(float(pos[1]), 6)
+
+
+def _full_layout(graph: nx.DiGraph) -> Dict[str, Position]:
+    try:
+        pos = nx.spring_layout(graph, k=LAYOUT_K, iterations=LAYOUT_ITERATIONS, seed=LAYOUT_SEED)
+    except Exception:
+        pos = nx.circular_layout(graph)
+    return {node: _round(p) for node, p in pos.items()}
+
+
+def compute_layout(graph: nx.DiGraph, previous: Optional[GraphLayout] = None) -> GraphLayout:
+    """
+    Lay out a graph, reusing a previous layout where the graph is unchanged
+
+    Nodes that are new, or that gained or lost an edge, are placed with
+    spring_layout while every other node stays fixed at its previous
+    coordinates. Without a usable previous layout the whole graph is laid
+    out from the seed.
+    """
+    structure_hash = graph_structure_hash(graph)
+    edges = frozenset(graph.edges())
+    nodes = list(graph.nodes())
+
+    positions = None
+    relaid_out = len(nodes)
+    if previous is not None and nodes:
+        old = previous.positions
+        changed = {node for node in nodes if node not in old}
+        for source, target in edges.symmetric_difference(previous.edges):
+            changed.add(source)
+            changed.add(target)
+        changed.intersection_update(nodes)
+
+        if len(changed) < len(nodes) and len(changed) <= INCREMENTAL_MAX_CHANGED * len(nodes):
+            relaid_out = len(changed)
+            if not changed:
+                positions = {node: old[node] for node in nodes}
+            else:
+                positions = _incremental_layout(graph, old, changed)
+
+    if positions is None:
+        positions = _full_layout(graph)
+
+    return GraphLayout(
+        structure_hash=structure_hash,
+        positions=positions,
+        edges=edges,
+        computed_at=datetime.now(),
+        relaid_out=relaid_out
+    )
+
+
+def _incremental_layout(graph: nx.DiGraph, old: Dict[str, Position], changed) -> Dict[str, Position]:
+    rng = random.Random(LAYOUT_SEED)
+    initial = {}
+    for node in graph.nodes():
+        if node in old:
+            initial[node] = old[node]
+            continue
+        # Start new nodes near the neighbours that already have a position
+        placed = [old[n] for n in nx.all_neighbors(graph, node) if n in old]
+        if placed:
+            cx = sum(p[0] for p in placed) / len(placed)
+            cy = sum(p[1] for p in placed) / len(placed)
+        else:
+            cx, cy = 0.0, 0.0
+        initial[node] = (cx + rng.uniform(-0.1, 0.1), cy + rng.uniform(-0.1, 0.1))
+
+    fixed = [node for node in graph.nodes() if node not in changed]
+    pos = nx.spring_layout(
+        graph,
+        k=LAYOUT_K,
+        pos=initial,
+        fixed=fixed,
+        iterations=LAYOUT_ITERATIONS,
+        seed=LAYOUT_SEED
+    )
+    # Fixed nodes keep their exact coordinates (spring_layout doesn't rescale when nodes are fixed)
+    return {node: (_round(pos[node]) if node in changed else old[node]) for node in graph.nodes()}
+
+
+class LayoutService:
+    """
+    Serves one layout per graph structure
+
+    Layouts are memoized per DependencyManager version and persisted to
+    `path`, so restarts and other processes reuse them. When the graph
+    changes, the persisted layout seeds an incremental relayout.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        self._memo: Optional[Tuple[DependencyManager, int, GraphLayout]] = None
+        self._latest: Optional[GraphLayout] = None
+        self._lock = threading.Lock()
+
+    def get(self, manager: DependencyManager) -> GraphLayout:
+        """Get the layout for a manager's current graph, computing it if needed"""
+        memo = self._memo
+        if memo is not None and memo[0] is manager and memo[1] == manager.version:
+            return memo[2]
+
+        with self._lock:
+            version = manager.version
+            memo = self._memo
+            if memo is not None and memo[0] is manager and memo[1] == version:
+                return memo[2]
+            layout = self.layout_graph(manager.graph)
+            self._memo = (manager, version, layout)
+            return layout
+
+    def layout_graph(self, graph: nx.DiGraph) -> GraphLayout:
+        """Get the layout for a graph, reusing the in-memory or persisted one when it matches"""
+        structure_hash = graph_structure_hash(graph)
+        previous = self._latest or self._load()
+        if previous is not None and previous.structure_hash == structure_hash:
+            layout = previous
+        else:
+            layout = compute_layout(graph, previous)
+            self._save(layout)
+        self._latest = layout
+        return layout
+
+    def refresh(self, manager: DependencyManager) -> threading.Thread:
+        """Compute a manager's layout in a background thread (e.g. after a reload)"""
+        thread = threading.Thread(target=self._refresh, args=(manager,), name="nexdex-layout", daemon=True)
+        thread.start()
+        return thread
+
+    def _refresh(self, manager: DependencyManager) -> None:
+        try:
+            self.get(manager)
+        except Exception as e:
+            print(f"Error computing graph layout: {e}")
+
+    def _load(self) -> Optional[GraphLayout]:
+        return load_layout(self.path) if self.path is not None else None
+
+    def _save(self, layout: GraphLayout) -> None:
+        if self.path is not None:
+            save_layout(layout, self.path)
+
+
+class LayoutCache:
+    """
+    Layouts for any number of graph structures, one file per structure hash
+
+    For callers that render graphs of several configs (reports, batch runs):
+    each structure keeps its own layout instead of replacing a single one. A
+    structure seen for the first time is laid out from the seed alone, so
+    its layout never depends on what was drawn before. At most
+    `max_entries` layouts stay in memory and `max_files` on disk (least
+    recently used removed first).
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_entries: int = 16, max_files: int = LAYOUT_MAX_FILES):
+        self.directory = Path(directory) if directory is not None else None
+        self.max_entries = max_entries
+        self.max_files = max_files
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, GraphLayout]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path_for(self, structure_hash: str) -> Optional[Path]:
+        """Where the layout for a structure is persisted"""
+        if self.directory is None:
+            return None
+        return self.directory / f"{structure_hash}.layout.json"
+
+    def layout_graph(self, graph: nx.DiGraph) -> GraphLayout:
+        """Get the layout for a graph from memory, disk, or by computing it"""
+        structure_hash = graph_structure_hash(graph)
+        path = self.path_for(structure_hash)
+        with self._lock:
+            layout = self._entries.get(structure_hash)
+            if layout is not None:
+                self._entries.move_to_end(structure_hash)
+                self.hits += 1
+            else:
+                layout = load_layout(path) if path is not None else None
+                if layout is not None and layout.structure_hash != structure_hash:
+                    layout = None
+                if layout is not None:
+                    self.hits += 1
+                    self._touch(path)
+                else:
+                    self.misses += 1
+                    layout = compute_layout(graph)
+                    if path is not None:
+                        save_layout(layout, path)
+                        self._prune_files()
+                self._entries[structure_hash] = layout
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return layout
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        """Mark a layout file as recently used"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _prune_files(self) -> None:
+        """Delete the least recently used layout files beyond `max_files`"""
+        try:
+            files = [(entry.stat().st_mtime, entry) for entry in self.directory.glob("*.layout.json")]
+        except OSError:
+            return
+        if len(files) <= self.max_files:
+            return
+        files.sort()
+        for _, entry in files[:len(files) - self.max_files]:
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+
+_caches: Dict[str, LayoutCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_layout_cache(directory) -> LayoutCache:
+    """Get the process-wide layout cache persisting to a directory"""
+    key = os.path.abspath(directory)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = LayoutCache(directory)
+            _caches[key] = cache
+        return cache
+
+
+
+@dataclass(frozen=True)
+class ImpactView:
+    """
+    The part of a graph worth drawing for one failure
+
+    `graph` holds the impacted services, their context and summary nodes
+    (dependency -> dependent edges). `summaries` maps each summary node to
+    the number of hidden services it stands for.
+    """
+    graph: nx.DiGraph
+    summaries: Dict[str, int]
+
+
+def impact_view(manager: DependencyManager, impacted: Iterable[str], radius: int = 1) -> ImpactView:
+    """
+    Select impacted services plus everything within `radius` hops of them
+
+    Hidden services adjacent to the selection are collapsed into one summary
+    node per business process and side (dependencies or dependents). Only
+    the selection and its direct neighbours are visited, so the cost grows
+    with the blast radius rather than the graph.
+    """
+    compiled = manager.compile()
+    records = compiled.records
+
+    shown = {compiled.index[name] for name in impacted if name in compiled.index}
+    frontier = list(shown)
+    for _ in range(max(0, radius)):
+        next_frontier = []
+        for current in frontier:
+            for neighbor in compiled.successors[current] + compiled.predecessors[current]:
+                if neighbor not in shown:
+                    shown.add(neighbor)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+
+    graph = nx.DiGraph()
+    members = sorted(shown)
+    graph.add_nodes_from(records[i].name for i in members)
+    groups: Dict[Tuple[str, str], set] = {}
+    summary_edges = []
+    for current in members:
+        name = records[current].name
+        for dependent in compiled.successors[current]:
+            if dependent in shown:
+                graph.add_edge(name, records[dependent].name)
+            else:
+                key = (records[dependent].business_process or "Other", "dependents")
+                groups.setdefault(key, set()).add(dependent)
+                summary_edges.append((name, key))
+        for dependency in compiled.predecessors[current]:
+            if dependency not in shown:
+                key = (records[dependency].business_process or "Other", "dependencies")
+                groups.setdefault(key, set()).add(dependency)
+                summary_edges.append((key, name))
+
+    labels = {
+        key: f"+{len(ids)} {key[0]}\n{key[1]}" for key, ids in groups.items()
+    }
+    for source, target in summary_edges:
+        graph.add_edge(labels.get(source, source), labels.get(target, target))
+
+    return ImpactView(
+        graph=graph,
+        summaries={labels[key]: len(ids) for key, ids in groups.items()}
+    )
+
+
+def layered_layout(graph: nx.DiGraph) -> Dict[Hashable, Position]:
+    """
+    Place nodes in rows by topological depth (dependencies above dependents)
+
+    Depth is the longest path from a node without dependencies, found with
+    Kahn's algorithm; nodes on cycles go one row below their deepest placed
+    dependency. Within a row, nodes are ordered by the mean position of
+    their dependencies to keep edges short. Linear apart from sorting rows.
+    """
+    indegree = {node: graph.in_degree(node) for node in graph}
+    depth = {node: 0 for node, degree in indegree.items() if degree == 0}
+    queue = deque(depth)
+    while queue:
+        node = queue.popleft()
+        for dependent in graph.successors(node):
+            depth[dependent] = max(depth.get(dependent, 0), depth[node] + 1)
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                queue.append(dependent)
+    for node in graph:
+        if indegree[node] > 0:
+            depth[node] = 1 + max((depth[p] for p in graph.predecessors(node) if p in depth), default=-1)
+
+    rows: Dict[int, list] = {}
+    for node, row in depth.items():
+        rows.setdefault(row, []).append(node)
+
+    positions: Dict[Hashable, Position] = {}
+    for row in sorted(rows):
+        def order(node):
+            placed = [positions[p][0] for p in graph.predecessors(node) if p in positions]
+            return (sum(placed) / len(placed) if placed else 0.0, str(node))
+        nodes = sorted(rows[row], key=order)
+        offset = (len(nodes) - 1) / 2
+        for i, node in enumerate(nodes):
+            positions[node] = (float(i - offset), float(-row))
+    return positions
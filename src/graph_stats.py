@@ -0,0 +1,105 @@
+"""
+Graph statistics maintained as a derived artifact per graph version
+"""
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .dependency_manager import DependencyManager
+
+FAILURE_COOLDOWN = 60.0  # Seconds before a failed computation is retried for the same graph version
+
+
+class GraphStatsCache:
+    """
+    Computes graph statistics once per DependencyManager version in a
+    background thread and serves the last result with stale-while-revalidate
+    semantics. Reads never block on a computation. A failed computation is
+    not retried for the same graph version until `failure_cooldown` seconds
+    have passed.
+    """
+
+    def __init__(self, failure_cooldown: float = FAILURE_COOLDOWN):
+        self.failure_cooldown = failure_cooldown
+        # (manager, version, stats) - replaced as a whole so reads need no lock.
+        # Holding the manager itself (not its id) keeps keys unambiguous.
+        self._entry: Optional[Tuple[DependencyManager, int, Dict]] = None
+        self._pending: Optional[Tuple[DependencyManager, int]] = None
+        # (manager, version, monotonic time, error) of the last failed computation
+        self._failure: Optional[Tuple[DependencyManager, int, float, str]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _matches(key: Optional[Tuple], manager: DependencyManager, version: int) -> bool:
+        return key is not None and key[0] is manager and key[1] == version
+
+    def get(self, manager: DependencyManager) -> Tuple[Optional[Dict], bool]:
+        """
+        Get statistics for a manager
+
+        Returns (stats, fresh). `stats` is None until a first computation has
+        finished; `fresh` is False when the stats belong to an older graph
+        version, in which case a refresh is started.
+        """
+        entry = self._entry
+        if self._matches(entry, manager, manager.version):
+            return entry[2], True
+
+        self.refresh(manager)
+        return (entry[2] if entry is not None else None), False
+
+    def failure(self, manager: DependencyManager) -> Optional[Tuple[str, int]]:
+        """(error, seconds until retry) while computing this manager's current version is backing off"""
+        failure = self._failure
+        if not self._matches(failure, manager, manager.version):
+            return None
+        remaining = failure[2] + self.failure_cooldown - time.monotonic()
+        if remaining <= 0:
+            return None
+        return failure[3], max(1, math.ceil(remaining))
+
+    def is_refreshing(self) -> bool:
+        """Whether a background computation is running"""
+        return self._pending is not None
+
+    def refresh(self, manager: DependencyManager) -> Optional[threading.Thread]:
+        """
+        Start computing statistics for a manager unless already current or running
+
+        Returns the started thread (None if nothing was started).
+        """
+        version = manager.version
+        with self._lock:
+            if self._matches(self._pending, manager, version) or self._matches(self._entry, manager, version):
+                return None
+            if self.failure(manager) is not None:
+                return None
+            self._pending = (manager, version)
+
+        thread = threading.Thread(
+            target=self._compute,
+            args=(manager, version),
+            name="nexdex-graph-stats",
+            daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _compute(self, manager: DependencyManager, version: int) -> None:
+        error = None
+        try:
+            stats = manager.get_graph_stats()
+        except Exception as e:
+            print(f"Error computing graph statistics: {e}")
+            stats = None
+            error = str(e) or type(e).__name__
+
+        with self._lock:
+            if stats is not None:
+                self._entry = (manager, version, stats)
+                self._failure = None
+            else:
+                self._failure = (manager, version, time.monotonic(), error)
+            if self._matches(self._pending, manager, version):
+                self._pending = None
@@ -0,0 +1,183 @@
+"""
+In-process background job queue for long-running simulations
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function when cancellation was requested"""
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are pending or running"""
+
+
+class Job:
+    """A unit of background work and its outcome"""
+
+    def __init__(self, kind: str, params: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params or {}
+        self.status = PENDING
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.finished_monotonic: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.progress_done = 0
+        self.progress_total: Optional[int] = None
+        self._cancel = threading.Event()
+        self._future: Optional[Future] = None
+
+    @property
+    def cancel_requested(self) -> bool:
+        """Whether cancellation was requested"""
+        return self._cancel.is_set()
+
+    def check_cancelled(self) -> None:
+        """Raise JobCancelled if cancellation was requested (call between work items)"""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def set_progress(self, done: int, total: Optional[int] = None) -> None:
+        """Record progress for status polling"""
+        self.progress_done = done
+        if total is not None:
+            self.progress_total = total
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert job status to dictionary (without the result)"""
+        return {
+            "id": self.id,
+            "type": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "progress": {"done": self.progress_done, "total": self.progress_total},
+            "error": self.error
+        }
+
+
+class JobManager:
+    """
+    Runs jobs on a bounded worker pool
+
+    At most `max_workers` jobs run at once and at most `max_pending` wait;
+    further submissions raise JobQueueFull. Finished jobs are kept for
+    `result_ttl` seconds and then evicted; beyond `max_finished` of them the
+    oldest are evicted early.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32, result_ttl: float = 600.0, max_finished: int = 256):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.max_finished = max(0, max_finished)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="nexdex-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args, params: Optional[Dict[str, Any]] = None) -> Job:
+        """
+        Queue `fn(job, *args)` and return its Job
+
+        The function should call job.check_cancelled() between work items and
+        may report progress with job.set_progress().
+        """
+        job = Job(kind, params)
+        with self._lock:
+            self._evict_expired()
+            active = sum(1 for j in self._jobs.values() if j.status in (PENDING, RUNNING))
+            if active >= self.max_workers + self.max_pending:
+                raise JobQueueFull(f"Too many jobs queued ({active}); try again later")
+            self._jobs[job.id] = job
+        job._future = self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id (None if unknown or evicted)"""
+        with self._lock:
+            self._evict_expired()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation; pending jobs are cancelled immediately"""
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return job
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            self._finish(job, CANCELLED)
+        return job
+
+    def counts(self) -> Dict[str, int]:
+        """Number of known jobs in each state"""
+        with self._lock:
+            self._evict_expired()
+            counts = {state: 0 for state in (PENDING, RUNNING) + FINISHED_STATES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel queued jobs and stop the worker pool"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job._cancel.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job, fn: Callable[..., Any], args) -> None:
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        job.started_at = datetime.now()
+        try:
+            job.result = fn(job, *args)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, FAILED)
+        else:
+            self._finish(job, SUCCEEDED)
+
+    @staticmethod
+    def _finish(job: Job, status: str) -> None:
+        job.finished_at = datetime.now()
+        job.finished_monotonic = time.monotonic()
+        job.status = status
+
+    def _evict_expired(self) -> None:
+        """Drop finished jobs older than the TTL, then the oldest beyond `max_finished` (caller holds the lock)"""
+        cutoff = time.monotonic() - self.result_ttl
+        finished = []
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_monotonic is None:
+                continue
+            if job.finished_monotonic < cutoff:
+                del self._jobs[job_id]
+            else:
+                finished.append((job.finished_monotonic, job_id))
+        if len(finished) > self.max_finished:
+            finished.sort()
+            for _, job_id in finished[:len(finished) - self.max_finished]:
+                del self._jobs[job_id]
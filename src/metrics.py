@@ -0,0 +1,294 @@
+"""
+In-process metrics registry with Prometheus text exposition
+"""
+import bisect
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Sharded(ABC):
+    """
+    Per-thread accumulation so recording never takes a lock
+
+    Each thread writes to its own dict; a scrape merges them. Shards of
+    threads that have exited are folded into `_retired` whenever a new
+    thread registers (and on every scrape), so short-lived request threads
+    don't accumulate even when nothing scrapes.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict]] = []
+        self._retired: Dict = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._lock:
+                self._fold_exited()
+                self._shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+            return shard
+
+    @abstractmethod
+    def _merge_into(self, target: Dict, shard: Dict) -> None:
+        """Add the values of `shard` to `target`"""
+
+    def _fold_exited(self) -> None:
+        """Merge shards of exited threads into `_retired` (caller holds the lock)"""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._merge_into(self._retired, shard.copy())
+        self._shards = live
+
+    def _collect(self) -> Dict:
+        with self._lock:
+            self._fold_exited()
+            merged: Dict = {}
+            self._merge_into(merged, self._retired)
+            for _, shard in self._shards:
+                # dict.copy() is atomic under the GIL; the owner may still be writing
+                self._merge_into(merged, shard.copy())
+            return merged
+
+
+class Counter(_Sharded):
+    """Monotonically increasing count, optionally labelled"""
+
+    kind = "counter"
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__()
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    def inc(self, amount: float = 1, *label_values: str) -> None:
+        """Add to the count for the given label values"""
+        if not self.registry.enabled:
+            return
+        shard = self._shard()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+    def _merge_into(self, target: Dict, shard: Dict) -> None:
+        for key, value in shard.items():
+            target[key] = target.get(key, 0) + value
+
+    def samples(self) -> Iterator[str]:
+        for label_values, value in sorted(self._collect().items()):
+            yield f"{self.name}_total{_format_labels(self.labels, label_values)} {_format_value(value)}"
+
+
+class Histogram(_Sharded):
+    """Distribution of observed values (e.g. latencies in seconds), optionally labelled"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: 'MetricsRegistry',
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__()
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one observation for the given label values"""
+        if not self.registry.enabled:
+            return
+        shard = self._shard()
+        state = shard.get(label_values)
+        if state is None:
+            # Per-bucket counts (not cumulative), then +Inf, sum and count
+            state = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            shard[label_values] = state
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    @contextmanager
+    def time(self, *label_values: str):
+        """Observe the duration of a with-block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def _merge_into(self, target: Dict, shard: Dict) -> None:
+        for key, state in shard.items():
+            merged = target.get(key)
+            if merged is None:
+                target[key] = list(state)
+            else:
+                for i, value in enumerate(state):
+                    merged[i] += value
+
+    def samples(self) -> Iterator[str]:
+        bounds = self.buckets + (math.inf,)
+        for label_values, state in sorted(self._collect().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, state):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}"
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(state[-2])}"
+            yield f"{self.name}_count{labels} {state[-1]}"
+
+
+GaugeValue = Union[float, Dict[LabelValues, float]]
+
+
+class CallbackMetric:
+    """
+    Gauge or counter whose value is read at scrape time
+
+    The callback returns a number, or {label values tuple: number} for a
+    labelled metric. Nothing is recorded on the hot path.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Optional[GaugeValue]],
+        labels: Sequence[str] = (),
+        kind: str = "gauge"
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labels = tuple(labels)
+        self.kind = kind
+
+    def samples(self) -> Iterator[str]:
+        try:
+            value = self.callback()
+        except Exception:
+            return
+        if value is None:
+            return
+        if not isinstance(value, dict):
+            value = {(): value}
+        suffix = "_total" if self.kind == "counter" else ""
+        for label_values, number in sorted(value.items()):
+            yield f"{self.name}{suffix}{_format_labels(self.labels, label_values)} {_format_value(number)}"
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text format"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric '{metric.name}' already registered as a different type")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter"""
+        return self._register(Counter(self, name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram"""
+        return self._register(Histogram(self, name, documentation, labels, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Optional[GaugeValue]],
+        labels: Sequence[str] = ()
+    ) -> CallbackMetric:
+        """Register a gauge read from `callback` at scrape time (replaces an earlier one)"""
+        metric = CallbackMetric(name, documentation, callback, labels)
+        with self._lock:
+            self._metrics[name] = metric
+        return metric
+
+    def callback_counter(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Optional[GaugeValue]],
+        labels: Sequence[str] = ()
+    ) -> CallbackMetric:
+        """Register a counter kept elsewhere (e.g. cache hit totals) and read at scrape time"""
+        metric = CallbackMetric(name, documentation, callback, labels, kind="counter")
+        with self._lock:
+            self._metrics[name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            # In format 0.0.4 the family name must match the samples, which for counters end in _total
+            family = f"{metric.name}_total" if metric.kind == "counter" else metric.name
+            lines.append(f"# HELP {family} {metric.documentation}")
+            lines.append(f"# TYPE {family} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry; NEXDEX_METRICS=0 turns recording off
+REGISTRY = MetricsRegistry(enabled=os.environ.get("NEXDEX_METRICS", "1").lower() not in ("0", "false", "no"))
@@ -1,8 +1,10 @@
 """
 Data models for NexDex Business Impact Simulator
 """
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Set
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional, Dict, Set, Iterable
 from datetime import datetime
 
 
@@ -48,10 +50,141 @@ class Service:
         )
 
 
+class ServiceRecord:
+    """
+    Compact, read-only view of a Service used internally by the engine
+    
+    Records carry an integer id (their position in the compiled graph), an
+    interned name and tuple dependencies, and hash on the id so set and dict
+    operations avoid string hashing. The JSON format matches Service.
+    """
+    __slots__ = ("id", "name", "depends_on", "business_process", "importance", "mttr", "description")
+    
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        depends_on: Iterable[str] = (),
+        business_process: str = "",
+        importance: int = 5,
+        mttr: int = 30,
+        description: Optional[str] = None
+    ):
+        self.id = id
+        self.name = sys.intern(name)
+        self.depends_on = tuple(sys.intern(d) for d in depends_on)
+        self.business_process = sys.intern(business_process) if business_process else ""
+        self.importance = importance
+        self.mttr = mttr
+        self.description = description
+    
+    def __hash__(self):
+        return self.id
+    
+    def __eq__(self, other):
+        if isinstance(other, ServiceRecord):
+            return self.id == other.id and self.name == other.name
+        return False
+    
+    def __repr__(self):
+        return f"ServiceRecord(id={self.id}, name={self.name!r})"
+    
+    def replace(self, **changes) -> 'ServiceRecord':
+        """Return a copy of this record with some fields changed"""
+        values = {slot: getattr(self, slot) for slot in self.__slots__}
+        values.update(changes)
+        return ServiceRecord(**values)
+    
+    def to_dict(self) -> Dict:
+        """Convert record to the same dictionary format as Service"""
+        return {
+            "name": self.name,
+            "depends_on": list(self.depends_on),
+            "business_process": self.business_process,
+            "importance": self.importance,
+            "mttr": self.mttr,
+            "description": self.description
+        }
+    
+    def to_service(self) -> Service:
+        """Convert record back to a mutable Service"""
+        return Service.from_dict(self.to_dict())
+    
+    @classmethod
+    def from_dict(cls, data: Dict, id: int) -> 'ServiceRecord':
+        """Create record from dictionary"""
+        return cls(
+            id=id,
+            name=data["name"],
+            depends_on=data.get("depends_on", ()),
+            business_process=data.get("business_process", ""),
+            importance=data.get("importance", 5),
+            mttr=data.get("mttr", 30),
+            description=data.get("description")
+        )
+    
+    @classmethod
+    def from_service(cls, service: Service, id: int) -> 'ServiceRecord':
+        """Create record from a Service"""
+        return cls(
+            id=id,
+            name=service.name,
+            depends_on=service.depends_on,
+            business_process=service.business_process,
+            importance=service.importance,
+            mttr=service.mttr,
+            description=service.description
+        )
+
+
+@dataclass(frozen=True)
+class ImpactOverlay:
+    """
+    Per-request what-if overrides layered over a shared service graph
+    
+    Simulations read importance and MTTR through the overlay instead of
+    mutating the DependencyManager, so concurrent what-if requests can share
+    one graph without locks or copies.
+    """
+    process_importance: Mapping[str, int] = field(default_factory=dict)
+    mttr: Mapping[str, int] = field(default_factory=dict)  # service name -> minutes
+    
+    def __post_init__(self):
+        # Read-only views of private copies, so the caller's dicts can't leak changes in
+        object.__setattr__(self, "process_importance", MappingProxyType(dict(self.process_importance)))
+        object.__setattr__(self, "mttr", MappingProxyType(dict(self.mttr)))
+    
+    def __bool__(self):
+        return bool(self.process_importance or self.mttr)
+    
+    def to_dict(self) -> Dict:
+        """Convert overlay to dictionary"""
+        return {
+            "process_importance": dict(self.process_importance),
+            "mttr": dict(self.mttr)
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'ImpactOverlay':
+        """Create overlay from dictionary, clamping importance to 1-10"""
+        data = data or {}
+        process_importance = {}
+        for process_name, score in (data.get("process_importance") or {}).items():
+            if isinstance(score, bool) or not isinstance(score, (int, float)):
+                raise ValueError(f"Invalid importance for process '{process_name}': {score!r}")
+            process_importance[process_name] = max(1, min(10, int(score)))
+        mttr = {}
+        for service_name, minutes in (data.get("mttr") or {}).items():
+            if isinstance(minutes, bool) or not isinstance(minutes, (int, float)) or minutes < 0:
+                raise ValueError(f"Invalid MTTR for service '{service_name}': {minutes!r}")
+            mttr[service_name] = int(minutes)
+        return cls(process_importance=process_importance, mttr=mttr)
+
+
 @dataclass
 class ImpactResult:
     """Represents the impact of a service failure"""
-    service: Service
+    service: ServiceRecord
     is_direct_failure: bool
     affected_business_processes: List[str]
     cascade_depth: int  # How many hops from original failure
@@ -0,0 +1,283 @@
+"""
+Pre-forking multi-process WSGI server built on the standard library
+
+The parent loads the application once and forks workers that share its
+memory copy-on-write. Each worker serves requests from the shared listening
+socket on a bounded thread pool. SIGHUP reloads the application in the
+parent and replaces the workers gracefully; SIGTERM or SIGINT stops them.
+"""
+import gc
+import os
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+POLL_INTERVAL = 0.5  # Seconds between checks for signals and worker exits
+MIN_WORKER_LIFETIME = 1.0  # Workers exiting sooner than this are respawned with a delay
+
+WSGIApp = Callable
+
+
+def default_workers() -> int:
+    """One worker per CPU core"""
+    return os.cpu_count() or 1
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """Request handler that logs errors but not every request"""
+
+    def log_request(self, code='-', size='-') -> None:
+        pass
+
+
+class _WorkerServer(WSGIServer):
+    """
+    WSGI server serving an inherited listening socket on a thread pool
+
+    At most `threads` requests are handled at once. When every thread is
+    busy the worker stops accepting, so the kernel hands new connections to
+    idle workers instead.
+    """
+
+    def __init__(self, listen_socket: socket.socket, server_name: str, app: WSGIApp, threads: int):
+        super().__init__(listen_socket.getsockname()[:2], QuietRequestHandler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = listen_socket
+        self.server_name = server_name
+        self.server_port = listen_socket.getsockname()[1]
+        self.setup_environ()
+        self.set_app(app)
+        self._slots = threading.BoundedSemaphore(threads)
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="nexdex-http")
+
+    def serve_until(self, should_stop: Callable[[], bool]) -> None:
+        """Accept and dispatch requests until `should_stop()` is true"""
+        with selectors.DefaultSelector() as selector:
+            selector.register(self, selectors.EVENT_READ)
+            while not should_stop():
+                if selector.select(POLL_INTERVAL):
+                    # Another worker may have accepted first; the non-blocking accept then just returns
+                    self._handle_request_noblock()
+
+    def get_request(self):
+        request, client_address = super().get_request()
+        # BSD/macOS accepted sockets inherit O_NONBLOCK from the listener; handlers need blocking reads
+        request.setblocking(True)
+        return request, client_address
+
+    def process_request(self, request, client_address) -> None:
+        self._slots.acquire()
+        try:
+            self._pool.submit(self._process_request, request, client_address)
+        except RuntimeError:
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _process_request(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self) -> None:
+        """Wait for in-flight requests, then close this worker's copy of the socket"""
+        self._pool.shutdown(wait=True)
+        super().server_close()
+
+
+class PreforkServer:
+    """
+    Runs `workers` forked processes of `threads` threads each
+
+    `load_app` is called in the parent (at start-up and on every SIGHUP) and
+    returns the WSGI application, or None if loading failed. `post_fork` is
+    called in each worker before it starts serving; start background threads
+    (watchers, pools) there, never in `load_app`, since threads don't survive
+    a fork.
+    """
+
+    def __init__(
+        self,
+        load_app: Callable[[], Optional[WSGIApp]],
+        host: str = "127.0.0.1",
+        port: int = 5555,
+        workers: Optional[int] = None,
+        threads: int = 8,
+        post_fork: Optional[Callable[[], None]] = None,
+        graceful_timeout: float = 30.0
+    ):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Pre-forking server requires os.fork (not available on this platform)")
+        self.load_app = load_app
+        self.host = host
+        self.port = port
+        self.workers = workers or default_workers()
+        self.threads = max(1, threads)
+        self.post_fork = post_fork
+        self.graceful_timeout = graceful_timeout
+        self._app: Optional[WSGIApp] = None
+        self._socket: Optional[socket.socket] = None
+        self._server_name = host
+        self._children: Dict[int, float] = {}  # pid -> start time (current generation)
+        self._retiring: Dict[int, float] = {}  # pid -> kill deadline (previous generations)
+        self._reload_requested = False
+        self._stop_requested = False
+        self._respawn_at = 0.0
+
+    def serve_forever(self) -> None:
+        """Bind, load the app, fork the workers and supervise them until stopped"""
+        self._socket = socket.create_server((self.host, self.port), backlog=128)
+        # Every idle worker wakes on a connection; a non-blocking accept lets the losers move on
+        self._socket.setblocking(False)
+        self.port = self._socket.getsockname()[1]
+        self._server_name = socket.getfqdn(self.host)
+
+        self._app = self.load_app()
+        if self._app is None:
+            self._socket.close()
+            raise RuntimeError("Application failed to load")
+
+        signal.signal(signal.SIGHUP, self._on_reload)
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+
+        print(f"Serving on http://{self.host}:{self.port} with {self.workers} workers x {self.threads} threads "
+              f"(parent pid {os.getpid()}; SIGHUP to reload)")
+        try:
+            self._freeze()
+            while len(self._children) < self.workers:
+                self._spawn()
+            while not self._stop_requested:
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self._restart()
+                self._reap()
+                self._maintain()
+                time.sleep(POLL_INTERVAL)
+        finally:
+            self._stop_all()
+            self._socket.close()
+
+    def _on_reload(self, signum, frame) -> None:
+        self._reload_requested = True
+
+    def _on_stop(self, signum, frame) -> None:
+        self._stop_requested = True
+
+    @staticmethod
+    def _freeze() -> None:
+        """Move loaded objects out of the collector's reach so workers don't copy pages by collecting them"""
+        gc.collect()
+        gc.freeze()
+
+    def _restart(self) -> None:
+        """Reload the app in the parent and replace the workers; keep the old ones if loading fails"""
+        print("Reloading application...")
+        gc.unfreeze()
+        app = self.load_app()
+        if app is None:
+            print("Reload failed; keeping current workers")
+            self._freeze()
+            return
+        self._app = app
+        self._freeze()
+
+        deadline = time.monotonic() + self.graceful_timeout
+        for pid in list(self._children):
+            self._signal(pid, signal.SIGTERM)
+            self._retiring[pid] = deadline
+        self._children.clear()
+        while len(self._children) < self.workers:
+            self._spawn()
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._run_worker()
+            except BaseException:
+                import traceback
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        self._children[pid] = time.monotonic()
+
+    def _run_worker(self) -> None:
+        parent = os.getppid()
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        # Ctrl+C reaches the whole process group; the parent decides how workers stop
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+        if self.post_fork is not None:
+            self.post_fork()
+
+        server = _WorkerServer(self._socket, self._server_name, self._app, self.threads)
+        try:
+            server.serve_until(lambda: stop.is_set() or os.getppid() != parent)
+        finally:
+            server.server_close()
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if self._retiring.pop(pid, None) is not None:
+                continue
+            started = self._children.pop(pid, None)
+            if started is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if not self._stop_requested:
+                print(f"Worker {pid} exited with status {code}; starting a replacement")
+                if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                    # Crash loop (e.g. post_fork failing): don't fork as fast as we can
+                    self._respawn_at = time.monotonic() + MIN_WORKER_LIFETIME
+
+    def _maintain(self) -> None:
+        now = time.monotonic()
+        for pid, deadline in list(self._retiring.items()):
+            if now >= deadline:
+                self._signal(pid, signal.SIGKILL)
+        if not self._stop_requested and now >= self._respawn_at:
+            while len(self._children) < self.workers:
+                self._spawn()
+
+    def _stop_all(self) -> None:
+        """Stop every worker gracefully, killing those that outlive the timeout"""
+        self._stop_requested = True
+        deadline = time.monotonic() + self.graceful_timeout
+        for pid in list(self._children):
+            self._signal(pid, signal.SIGTERM)
+            self._retiring[pid] = deadline
+        self._children.clear()
+        while self._retiring:
+            self._reap()
+            self._maintain()
+            if self._retiring:
+                time.sleep(0.05)
+
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
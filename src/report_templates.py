@@ -0,0 +1,565 @@
+"""
+HTML report templates, compiled once per process
+"""
+import os
+import threading
+from typing import Optional
+
+from jinja2 import BytecodeCache, DictLoader, Environment, FileSystemBytecodeCache, Template
+from markupsafe import Markup
+
+# Static stylesheets are injected as ready-made markup instead of being part
+# of the templates, so they are neither parsed nor compiled
+IMPACT_REPORT_CSS = """        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            background: #f5f5f5;
+            padding: 20px;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background: white;
+            padding: 40px;
+            border-radius: 8px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        h1 { color: #2c3e50; margin-bottom: 10px; }
+        h2 { color: #34495e; margin-top: 30px; margin-bottom: 15px; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
+        h3 { color: #555; margin-top: 20px; margin-bottom: 10px; }
+        .timestamp { color: #7f8c8d; font-size: 0.9em; margin-bottom: 30px; }
+        .summary {
+            background: #ecf0f1;
+            padding: 20px;
+            border-radius: 5px;
+            margin: 20px 0;
+        }
+        .summary-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 15px;
+            margin-top: 15px;
+        }
+        .summary-item {
+            background: white;
+            padding: 15px;
+            border-radius: 5px;
+            border-left: 4px solid #3498db;
+        }
+        .summary-item strong { display: block; color: #7f8c8d; font-size: 0.85em; margin-bottom: 5px; }
+        .summary-item .value { font-size: 1.5em; color: #2c3e50; font-weight: bold; }
+        .alert { background: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; margin: 20px 0; border-radius: 5px; }
+        .alert-danger { background: #f8d7da; border-left-color: #dc3545; }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 20px 0;
+        }
+        th, td {
+            padding: 12px;
+            text-align: left;
+            border-bottom: 1px solid #ddd;
+        }
+        th {
+            background: #3498db;
+            color: white;
+            font-weight: 600;
+        }
+        tr:hover { background: #f8f9fa; }
+        .badge {
+            display: inline-block;
+            padding: 4px 8px;
+            border-radius: 3px;
+            font-size: 0.85em;
+            font-weight: 600;
+        }
+        .badge-direct { background: #dc3545; color: white; }
+        .badge-cascade { background: #ffc107; color: #333; }
+        .impact-card {
+            background: #f8f9fa;
+            padding: 20px;
+            margin: 15px 0;
+            border-radius: 5px;
+            border-left: 4px solid #3498db;
+        }
+        .impact-high { border-left-color: #dc3545; }
+        .impact-medium { border-left-color: #ffc107; }
+        .impact-low { border-left-color: #28a745; }
+        .score {
+            display: inline-block;
+            padding: 5px 10px;
+            background: #3498db;
+            color: white;
+            border-radius: 20px;
+            font-weight: bold;
+        }
+        ul { margin: 10px 0 10px 20px; }
+        .recommendations { background: #d1ecf1; border-left: 4px solid #17a2b8; padding: 20px; margin: 20px 0; border-radius: 5px; }"""
+
+COMPARISON_REPORT_CSS = """        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            padding: 40px 20px;
+            color: #333;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background: white;
+            border-radius: 8px;
+            box-shadow: 0 10px 40px rgba(0,0,0,0.3);
+            overflow: hidden;
+        }
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 40px;
+            text-align: center;
+        }
+        .header h1 { font-size: 2.5em; margin-bottom: 10px; }
+        .header p { font-size: 1.1em; opacity: 0.9; }
+        .content { padding: 40px; }
+        .comparison-table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 30px 0;
+            font-size: 1em;
+        }
+        .comparison-table th {
+            background: #f5f5f5;
+            padding: 15px;
+            text-align: left;
+            border-bottom: 2px solid #667eea;
+            font-weight: 600;
+            color: #667eea;
+        }
+        .comparison-table td {
+            padding: 12px 15px;
+            border-bottom: 1px solid #e0e0e0;
+        }
+        .comparison-table tr:hover { background: #f9f9f9; }
+        .metric-label { font-weight: 600; color: #667eea; }
+        .value-positive { color: #28a745; font-weight: 600; }
+        .value-negative { color: #dc3545; font-weight: 600; }
+        .value-neutral { color: #666; }
+        .scenario-row {
+            background: #f0f4ff;
+            font-weight: 600;
+        }
+        .comparison-card {
+            display: grid;
+            grid-template-columns: 1fr 1fr;
+            gap: 30px;
+            margin: 30px 0;
+        }
+        .card {
+            padding: 20px;
+            background: #f9f9f9;
+            border-left: 4px solid #667eea;
+            border-radius: 4px;
+        }
+        .card h3 { color: #667eea; margin-bottom: 15px; }
+        .card-item {
+            display: flex;
+            justify-content: space-between;
+            padding: 8px 0;
+            border-bottom: 1px solid #e0e0e0;
+        }
+        .card-item:last-child { border-bottom: none; }
+        .card-label { font-weight: 500; color: #666; }
+        .card-value { font-weight: 700; color: #333; }
+        .section { margin: 30px 0; }
+        .section h2 {
+            color: #667eea;
+            font-size: 1.5em;
+            margin-bottom: 15px;
+            padding-bottom: 10px;
+            border-bottom: 2px solid #667eea;
+        }
+        .worse-scenario {
+            background: #fff3cd;
+            border-left: 4px solid #ffc107;
+            padding: 20px;
+            border-radius: 4px;
+            margin: 20px 0;
+        }
+        .unique-services {
+            display: grid;
+            grid-template-columns: 1fr 1fr;
+            gap: 20px;
+            margin: 20px 0;
+        }
+        .service-list {
+            padding: 15px;
+            background: #f5f5f5;
+            border-radius: 4px;
+            border-left: 4px solid #667eea;
+        }
+        .service-list h4 { color: #667eea; margin-bottom: 10px; }
+        .service-list ul { list-style: none; }
+        .service-list li {
+            padding: 5px 0;
+            color: #666;
+        }
+        .service-list li:before {
+            content: "▸ ";
+            color: #667eea;
+            font-weight: bold;
+            margin-right: 5px;
+        }
+        .footer {
+            background: #f5f5f5;
+            padding: 20px 40px;
+            text-align: center;
+            color: #999;
+            font-size: 0.9em;
+            border-top: 1px solid #e0e0e0;
+        }"""
+
+IMPACT_REPORT_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>NexDex Impact Report</title>
+    <style>
+{{ impact_report_css }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>🚨 NexDex Business Impact Report</h1>
+        <div class="timestamp">Generated: {{ timestamp }}</div>
+        
+        <div class="alert alert-danger">
+            <strong>⚠️ Simulated Failure:</strong> {{ failed_services }}
+        </div>
+        
+        <div class="summary">
+            <h2>Executive Summary</h2>
+            <div class="summary-grid">
+                <div class="summary-item">
+                    <strong>Total Services Affected</strong>
+                    <div class="value">{{ total_services }}</div>
+                </div>
+                <div class="summary-item">
+                    <strong>Total Impact Score</strong>
+                    <div class="value">{{ total_impact }}</div>
+                </div>
+                <div class="summary-item">
+                    <strong>Business Processes</strong>
+                    <div class="value">{{ business_processes_count }}</div>
+                </div>
+                <div class="summary-item">
+                    <strong>Cascade Failures</strong>
+                    <div class="value">{{ cascade_count }}</div>
+                </div>
+            </div>
+        </div>
+        
+        <h2>📊 Impact Analysis</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>Service</th>
+                    <th>Type</th>
+                    <th>Business Process</th>
+                    <th>Impact Score</th>
+                    <th>Downtime (min)</th>
+                    <th>Cascade Depth</th>
+                </tr>
+            </thead>
+            <tbody>
+                {% for impact in impacts %}
+                <tr>
+                    <td><strong>{{ impact.service.name }}</strong></td>
+                    <td>
+                        {% if impact.is_direct_failure %}
+                        <span class="badge badge-direct">Direct</span>
+                        {% else %}
+                        <span class="badge badge-cascade">Cascade</span>
+                        {% endif %}
+                    </td>
+                    <td>{{ impact.business_process }}</td>
+                    <td><span class="score">{{ "%.2f"|format(impact.impact_score) }}</span></td>
+                    <td>{{ impact.estimated_downtime }}</td>
+                    <td>{{ impact.cascade_depth }}</td>
+                </tr>
+                {% endfor %}
+            </tbody>
+        </table>
+        
+        <h2>📋 Detailed Breakdown</h2>
+        {% for impact in impacts %}
+        <div class="impact-card {% if impact.impact_score > 500 %}impact-high{% elif impact.impact_score > 200 %}impact-medium{% else %}impact-low{% endif %}">
+            <h3>{{ loop.index }}. {{ impact.service.name }}</h3>
+            <p><strong>Impact Score:</strong> <span class="score">{{ "%.2f"|format(impact.impact_score) }}</span></p>
+            <p><strong>Failure Type:</strong> {% if impact.is_direct_failure %}Direct Failure{% else %}Cascading Failure ({{ impact.cascade_depth }} hop(s)){% endif %}</p>
+            <p><strong>Business Process:</strong> {{ impact.business_process }}</p>
+            <p><strong>Service Importance:</strong> {{ impact.service.importance }}/10</p>
+            <p><strong>Estimated Downtime:</strong> {{ impact.estimated_downtime }} minutes</p>
+            {% if impact.dependent_services %}
+            <p><strong>Services Depending on This:</strong> {{ impact.dependent_services|join(', ') }}</p>
+            {% endif %}
+        </div>
+        {% endfor %}
+        
+        <div class="recommendations">
+            <h2>💡 Recommendations</h2>
+            <ul>
+                <li>Consider implementing redundancy for high-impact services</li>
+                <li>Review and optimize MTTR for critical services</li>
+                <li>Implement circuit breakers to prevent cascade failures</li>
+                <li>Regular disaster recovery drills for affected business processes</li>
+                <li>Monitor dependencies and set up alerting for critical paths</li>
+            </ul>
+        </div>
+    </div>
+</body>
+</html>
+        """
+
+COMPARISON_REPORT_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>NexDex Scenario Comparison</title>
+    <style>
+{{ comparison_report_css }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🎯 Scenario Comparison Report</h1>
+            <p>NexDex Business Impact Analysis</p>
+        </div>
+        <div class="content">
+            <div class="section">
+                <h2>Scenarios Being Compared</h2>
+                <div class="comparison-card">
+                    <div class="card">
+                        <h3>Scenario 1</h3>
+                        <div class="card-item">
+                            <span class="card-label">Failed Services:</span>
+                            <span class="card-value">{{ failed_services_1|join(', ') }}</span>
+                        </div>
+                    </div>
+                    <div class="card">
+                        <h3>Scenario 2</h3>
+                        <div class="card-item">
+                            <span class="card-label">Failed Services:</span>
+                            <span class="card-value">{{ failed_services_2|join(', ') }}</span>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            
+            <div class="section">
+                <h2>Impact Metrics Comparison</h2>
+                <table class="comparison-table">
+                    <thead>
+                        <tr class="scenario-row">
+                            <th>Metric</th>
+                            <th>Scenario 1</th>
+                            <th>Scenario 2</th>
+                            <th>Difference</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        <tr>
+                            <td class="metric-label">Total Impact Score</td>
+                            <td>{{ summary1['total_impact_score']|round(2) }}</td>
+                            <td>{{ summary2['total_impact_score']|round(2) }}</td>
+                            <td class="{% if impact_diff > 0 %}value-negative{% elif impact_diff < 0 %}value-positive{% else %}value-neutral{% endif %}">
+                                {{ impact_diff|round(2) }} ({{ impact_pct_diff|round(1) }}%)
+                            </td>
+                        </tr>
+                        <tr>
+                            <td class="metric-label">Services Affected</td>
+                            <td>{{ summary1['total_services_affected'] }}</td>
+                            <td>{{ summary2['total_services_affected'] }}</td>
+                            <td class="{% if services_diff > 0 %}value-negative{% elif services_diff < 0 %}value-positive{% else %}value-neutral{% endif %}">
+                                {{ services_diff_formatted }}
+                            </td>
+                        </tr>
+                        <tr>
+                            <td class="metric-label">Business Processes</td>
+                            <td>{{ summary1['business_processes_affected'] }}</td>
+                            <td>{{ summary2['business_processes_affected'] }}</td>
+                            <td class="{% if proc_diff > 0 %}value-negative{% else %}value-positive{% endif %}">
+                                {{ proc_diff_formatted }}
+                            </td>
+                        </tr>
+                        <tr>
+                            <td class="metric-label">Direct Failures</td>
+                            <td>{{ summary1['direct_failures'] }}</td>
+                            <td>{{ summary2['direct_failures'] }}</td>
+                            <td class="value-neutral">
+                                {{ direct_diff_formatted }}
+                            </td>
+                        </tr>
+                        <tr>
+                            <td class="metric-label">Cascade Failures</td>
+                            <td>{{ summary1['cascade_failures'] }}</td>
+                            <td>{{ summary2['cascade_failures'] }}</td>
+                            <td class="{% if cascade_diff > 0 %}value-negative{% else %}value-positive{% endif %}">
+                                {{ cascade_diff_formatted }}
+                            </td>
+                        </tr>
+                        <tr>
+                            <td class="metric-label">Avg Impact/Service</td>
+                            <td>{{ summary1['average_impact_per_service']|round(2) }}</td>
+                            <td>{{ summary2['average_impact_per_service']|round(2) }}</td>
+                            <td class="value-neutral">
+                                {{ avg_diff_formatted }}
+                            </td>
+                        </tr>
+                    </tbody>
+                </table>
+            </div>
+            
+            <div class="section">
+                <div class="worse-scenario">
+                    <h3>⚠️ Key Insight</h3>
+                    <p><strong>{{ worse_scenario_label }}</strong> has {{ "GREATER" if is_worse_scenario_2 else "LOWER" }} business impact 
+                    {{ (impact_diff|abs)|round(2) }} impact points ({{ (impact_pct_diff|abs)|round(1) }}%) 
+                    {{ "MORE severe" if is_worse_scenario_2 else "LESS severe" }}.</p>
+                </div>
+            </div>
+            
+            <div class="section">
+                <h2>Affected Services Analysis</h2>
+                <div class="unique-services">
+                    {% if unique_to_first %}
+                    <div class="service-list">
+                        <h4>🔴 Unique to Scenario 1</h4>
+                        <ul>
+                            {% for service in unique_to_first|sort %}
+                            <li>{{ service }}</li>
+                            {% endfor %}
+                        </ul>
+                    </div>
+                    {% endif %}
+                    {% if unique_to_second %}
+                    <div class="service-list">
+                        <h4>🔴 Unique to Scenario 2</h4>
+                        <ul>
+                            {% for service in unique_to_second|sort %}
+                            <li>{{ service }}</li>
+                            {% endfor %}
+                        </ul>
+                    </div>
+                    {% endif %}
+                </div>
+                {% if common_services %}
+                <div class="service-list" style="grid-column: 1 / -1;">
+                    <h4>🟡 Affected in Both Scenarios</h4>
+                    <ul>
+                        {% for service in common_services|sort %}
+                        <li>{{ service }}</li>
+                        {% endfor %}
+                    </ul>
+                </div>
+                {% endif %}
+            </div>
+            
+            <div class="section">
+                <h2>Highest Impact Services</h2>
+                <div class="comparison-card">
+                    {% if highest1 %}
+                    <div class="card">
+                        <h3>Scenario 1</h3>
+                        <div class="card-item">
+                            <span class="card-label">Service:</span>
+                            <span class="card-value">{{ highest1['service_name'] }}</span>
+                        </div>
+                        <div class="card-item">
+                            <span class="card-label">Impact Score:</span>
+                            <span class="card-value">{{ highest1['impact_score']|round(2) }}</span>
+                        </div>
+                    </div>
+                    {% endif %}
+                    {% if highest2 %}
+                    <div class="card">
+                        <h3>Scenario 2</h3>
+                        <div class="card-item">
+                            <span class="card-label">Service:</span>
+                            <span class="card-value">{{ highest2['service_name'] }}</span>
+                        </div>
+                        <div class="card-item">
+                            <span class="card-label">Impact Score:</span>
+                            <span class="card-value">{{ highest2['impact_score']|round(2) }}</span>
+                        </div>
+                    </div>
+                    {% endif %}
+                </div>
+            </div>
+        </div>
+        <div class="footer">
+            <p>Generated on {{ generated_at }} | NexDex v1.0.0</p>
+        </div>
+    </div>
+</body>
+</html>
+        """
+
+TEMPLATES = {
+    "impact_report.html": IMPACT_REPORT_TEMPLATE,
+    "comparison_report.html": COMPARISON_REPORT_TEMPLATE
+}
+
+_environment: Optional[Environment] = None
+_environment_lock = threading.Lock()
+
+
+def _bytecode_cache() -> Optional[BytecodeCache]:
+    """
+    Cache compiled templates on disk so new processes skip compilation
+
+    NEXDEX_TEMPLATE_CACHE names the directory ("off" disables it); by
+    default Jinja's per-user directory under the system temp dir is used.
+    """
+    directory = os.environ.get("NEXDEX_TEMPLATE_CACHE")
+    if directory and directory.lower() in ("0", "off", "false", "no"):
+        return None
+    try:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            return FileSystemBytecodeCache(directory)
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError) as e:
+        print(f"Template bytecode cache disabled: {e}")
+        return None
+
+
+def get_environment() -> Environment:
+    """Get the process-wide Jinja environment for reports"""
+    global _environment
+
+    if _environment is None:
+        with _environment_lock:
+            if _environment is None:
+                environment = Environment(
+                    loader=DictLoader(TEMPLATES),
+                    bytecode_cache=_bytecode_cache(),
+                    auto_reload=False,
+                    cache_size=-1
+                )
+                environment.globals.update(
+                    impact_report_css=Markup(IMPACT_REPORT_CSS),
+                    comparison_report_css=Markup(COMPARISON_REPORT_CSS)
+                )
+                _environment = environment
+    return _environment
+
+
+def get_template(name: str) -> Template:
+    """Get a compiled report template (compiled on first use only)"""
+    return get_environment().get_template(name)
@@ -0,0 +1,116 @@
+"""
+In-process catalog of scenario JSON files with change-based invalidation
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .models import Scenario
+
+
+class ScenarioCatalog:
+    """
+    Caches parsed scenarios from a directory keyed by file name, mtime and size
+
+    Each scan is a single os.scandir pass; only files whose mtime or size
+    changed since the last scan are re-read. Files that fail to parse are
+    remembered too, so they are reported but not re-read until they change.
+    """
+
+    def __init__(self, directory: str = "scenarios"):
+        self.directory = Path(directory)
+        # file name -> (mtime_ns, size, scenario or None, error or None)
+        self._entries: Dict[str, Tuple[int, int, Optional[Scenario], Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parse(path: str) -> Tuple[Optional[Scenario], Optional[str]]:
+        try:
+            with open(path, 'r') as f:
+                return Scenario.from_dict(json.load(f)), None
+        except Exception as e:
+            return None, str(e)
+
+    def scan(self) -> Tuple[List[Scenario], List[Tuple[str, str]]]:
+        """
+        Refresh the catalog from disk
+
+        Returns (scenarios sorted by file name, [(file name, error)] for files
+        that could not be loaded).
+        """
+        with self._lock:
+            seen = {}
+            try:
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        if not entry.name.endswith(".json") or not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                        cached = self._entries.get(entry.name)
+                        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                            seen[entry.name] = cached
+                        else:
+                            scenario, error = self._parse(entry.path)
+                            seen[entry.name] = (stat.st_mtime_ns, stat.st_size, scenario, error)
+            except FileNotFoundError:
+                pass
+            self._entries = seen
+
+        scenarios = []
+        errors = []
+        for name in sorted(seen):
+            _, _, scenario, error = seen[name]
+            if scenario is not None:
+                scenarios.append(scenario)
+            else:
+                errors.append((name, error))
+        return scenarios, errors
+
+    def fingerprint(self) -> Tuple[Tuple[str, int, int], ...]:
+        """
+        Scan and return (file name, mtime_ns, size) for every scenario file
+
+        Derived from file metadata only, so every process serving the same
+        directory computes the same fingerprint.
+        """
+        self.scan()
+        with self._lock:
+            return tuple(sorted((name, entry[0], entry[1]) for name, entry in self._entries.items()))
+
+    def get(self, scenario_name: str) -> Scenario:
+        """Get one scenario by name, re-reading its file only if it changed"""
+        filename = f"{scenario_name}.json"
+        path = self.directory / filename
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Scenario '{scenario_name}' not found")
+
+        cached = self._entries.get(filename)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            scenario, error = cached[2], cached[3]
+        else:
+            scenario, error = self._parse(str(path))
+            with self._lock:
+                self._entries[filename] = (stat.st_mtime_ns, stat.st_size, scenario, error)
+
+        if scenario is None:
+            raise ValueError(f"Error loading {filename}: {error}")
+        return scenario
+
+
+_catalogs: Dict[str, ScenarioCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(directory: str = "scenarios") -> ScenarioCatalog:
+    """Get the process-wide catalog for a directory"""
+    key = os.path.abspath(directory)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = ScenarioCatalog(directory)
+            _catalogs[key] = catalog
+        return catalog
@@ -0,0 +1,80 @@
+"""
+Single-file scenario packs (JSON Lines) and streaming result writers
+"""
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .models import Scenario, SimulationResult
+
+PACK_SUFFIXES = (".jsonl", ".ndjson")
+
+
+def is_scenario_pack(path) -> bool:
+    """Whether a path names a JSON Lines scenario pack"""
+    return Path(path).suffix.lower() in PACK_SUFFIXES
+
+
+def iter_scenario_pack(path) -> Iterator[Scenario]:
+    """Lazily read scenarios from a pack, one JSON object per line"""
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield Scenario.from_dict(json.loads(line))
+            except Exception as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from e
+
+
+def write_scenario_pack(scenarios: Iterable[Scenario], path) -> int:
+    """Write scenarios to a pack, returning how many were written"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(path, 'w') as f:
+        for scenario in scenarios:
+            f.write(json.dumps(scenario.to_dict()))
+            f.write("\n")
+            count += 1
+    return count
+
+
+class ResultStreamWriter:
+    """Writes one JSON line per simulated scenario, matching the pack order"""
+
+    def __init__(self, path, include_impacts: bool = True):
+        self.path = Path(path)
+        self.include_impacts = include_impacts
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> 'ResultStreamWriter':
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w')
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Flush and close the output file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, scenario: Scenario, result: Optional[SimulationResult], error: Optional[str] = None) -> None:
+        """Write the result (or error) for one scenario"""
+        record = {"scenario": scenario.name}
+        if result is not None:
+            data = result.to_dict()
+            if not self.include_impacts:
+                data.pop("impacts")
+            record.update(data)
+        else:
+            record["failed_services"] = scenario.failed_services
+            record["error"] = error
+        self._file.write(json.dumps(record))
+        self._file.write("\n")
+        self.count += 1
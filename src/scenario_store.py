@@ -0,0 +1,182 @@
+"""
+SQLite-backed scenario repository with a tag index
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .models import Scenario
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    name TEXT PRIMARY KEY,
+    description TEXT NOT NULL DEFAULT '',
+    failed_services TEXT NOT NULL,
+    tags TEXT NOT NULL DEFAULT '[]',
+    created_at TEXT NOT NULL,
+    peak_hours INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS scenario_tags (
+    scenario TEXT NOT NULL REFERENCES scenarios(name) ON DELETE CASCADE,
+    tag TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (scenario, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_scenario_tags_tag ON scenario_tags(tag, scenario);
+CREATE INDEX IF NOT EXISTS idx_scenarios_created_at ON scenarios(created_at);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO store_meta (key, value) VALUES ('revision', 0);
+CREATE TRIGGER IF NOT EXISTS scenarios_revision_insert AFTER INSERT ON scenarios
+BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'revision'; END;
+CREATE TRIGGER IF NOT EXISTS scenarios_revision_update AFTER UPDATE ON scenarios
+BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'revision'; END;
+CREATE TRIGGER IF NOT EXISTS scenarios_revision_delete AFTER DELETE ON scenarios
+BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'revision'; END;
+"""
+
+_COLUMNS = "name, description, failed_services, tags, created_at, peak_hours"
+_JOINED_COLUMNS = "s.name, s.description, s.failed_services, s.tags, s.created_at, s.peak_hours"
+
+
+def _row_to_scenario(row: Tuple) -> Scenario:
+    name, description, failed_services, tags, created_at, peak_hours = row
+    return Scenario(
+        name=name,
+        description=description,
+        failed_services=json.loads(failed_services),
+        created_at=datetime.fromisoformat(created_at),
+        tags=json.loads(tags),
+        peak_hours=bool(peak_hours)
+    )
+
+
+def _scenario_to_row(scenario: Scenario) -> Tuple:
+    return (
+        scenario.name,
+        scenario.description,
+        json.dumps(scenario.failed_services),
+        json.dumps(scenario.tags),
+        scenario.created_at.isoformat(),
+        int(bool(scenario.peak_hours))
+    )
+
+
+class ScenarioStore:
+    """Stores scenarios in SQLite with indexes on name and tags"""
+
+    def __init__(self, db_path: str = "scenarios/scenarios.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections are not shared across threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path))
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def save(self, scenario: Scenario) -> None:
+        """Insert or replace a scenario"""
+        self.save_many([scenario])
+
+    def save_many(self, scenarios: Iterable[Scenario]) -> int:
+        """Insert or replace many scenarios in one transaction"""
+        count = 0
+        with self._connect() as conn:
+            for scenario in scenarios:
+                conn.execute("DELETE FROM scenario_tags WHERE scenario = ?", (scenario.name,))
+                conn.execute(
+                    f"INSERT OR REPLACE INTO scenarios ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                    _scenario_to_row(scenario)
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO scenario_tags (scenario, tag) VALUES (?, ?)",
+                    [(scenario.name, tag) for tag in scenario.tags]
+                )
+                count += 1
+        return count
+
+    def get(self, name: str) -> Optional[Scenario]:
+        """Get a scenario by name"""
+        row = self._connect().execute(
+            f"SELECT {_COLUMNS} FROM scenarios WHERE name = ?", (name,)
+        ).fetchone()
+        return _row_to_scenario(row) if row else None
+
+    def delete(self, name: str) -> bool:
+        """Delete a scenario, returning whether it existed"""
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM scenarios WHERE name = ?", (name,))
+        return cursor.rowcount > 0
+
+    def list(self, tag: Optional[str] = None, limit: Optional[int] = None, offset: int = 0) -> List[Scenario]:
+        """List scenarios ordered by name, optionally filtered by tag (case-insensitive)"""
+        if tag:
+            sql = (
+                f"SELECT {_JOINED_COLUMNS} "
+                "FROM scenario_tags t JOIN scenarios s ON s.name = t.scenario "
+                "WHERE t.tag = ? ORDER BY s.name LIMIT ? OFFSET ?"
+            )
+            params = (tag, -1 if limit is None else limit, offset)
+        else:
+            sql = f"SELECT {_COLUMNS} FROM scenarios ORDER BY name LIMIT ? OFFSET ?"
+            params = (-1 if limit is None else limit, offset)
+        return [_row_to_scenario(row) for row in self._connect().execute(sql, params)]
+
+    def count(self, tag: Optional[str] = None) -> int:
+        """Count scenarios, optionally filtered by tag"""
+        if tag:
+            row = self._connect().execute("SELECT COUNT(*) FROM scenario_tags WHERE tag = ?", (tag,)).fetchone()
+        else:
+            row = self._connect().execute("SELECT COUNT(*) FROM scenarios").fetchone()
+        return row[0]
+
+    def revision(self) -> int:
+        """Counter bumped by every write, including writes from other processes"""
+        row = self._connect().execute("SELECT value FROM store_meta WHERE key = 'revision'").fetchone()
+        return row[0]
+
+    def import_directory(self, directory: str = "scenarios") -> Tuple[int, List[str]]:
+        """
+        Bulk import scenario JSON files from a directory
+
+        Returns (number imported, error messages for files that failed to load).
+        """
+        scenarios = []
+        errors = []
+        for filepath in sorted(Path(directory).glob("*.json")):
+            try:
+                with open(filepath, 'r') as f:
+                    scenarios.append(Scenario.from_dict(json.load(f)))
+            except Exception as e:
+                errors.append(f"{filepath.name}: {e}")
+        return self.save_many(scenarios), errors
+
+    def export_directory(self, directory: str = "scenarios") -> int:
+        """Export every scenario as a JSON file in a directory"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        count = 0
+        for scenario in self.list():
+            with open(directory / f"{scenario.name}.json", 'w') as f:
+                json.dump(scenario.to_dict(), f, indent=2)
+            count += 1
+        return count
@@ -1,15 +1,101 @@
 """
 Simulation engine for service failure impact analysis
 """
-from typing import List, Set
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
 import math
+import time
 
-from .models import Service, ImpactResult, SimulationResult
-from .dependency_manager import DependencyManager
+from .models import ServiceRecord, ImpactOverlay, ImpactResult, Scenario, SimulationResult
+from .dependency_manager import CompiledGraph, DependencyManager
+from .metrics import REGISTRY
 
 # Configuration
 PEAK_HOURS_MULTIPLIER = 1.2  # 20% increase in impact during peak hours
+BATCH_DEDUP_CACHE_SIZE = 4096  # Distinct failure sets remembered while streaming a batch
+
+SIMULATION_STAGE_SECONDS = REGISTRY.histogram(
+    "nexdex_simulation_stage_seconds",
+    "Time spent in each simulation stage",
+    labels=("stage",)
+)
+
+
+def canonical_failure_key(failed_services: Iterable[str], peak_hours: bool = False) -> Tuple[Tuple[str, ...], bool]:
+    """Canonical form of a failure scenario: sorted unique service names plus peak flag"""
+    return tuple(sorted(set(failed_services))), bool(peak_hours)
+
+
+@dataclass
+class BatchStats:
+    """Counters for a deduplicated batch run"""
+    scenarios: int = 0
+    simulated: int = 0
+    errors: int = 0
+    
+    @property
+    def dedup_ratio(self) -> float:
+        """Scenarios per simulation actually run (1.0 means no duplicates)"""
+        return self.scenarios / self.simulated if self.simulated else 1.0
+
+
+class TraversalCache:
+    """
+    Traversal and per-service impact work shared across many simulations
+
+    Valid for one dependency manager version and overlay; `bind` clears it
+    when the graph, the process importances or the overlay change. Each of
+    the two maps keeps at most `max_entries` entries, least recently used
+    evicted first.
+    """
+    
+    def __init__(self, max_entries: int = BATCH_DEDUP_CACHE_SIZE):
+        self.max_entries = max(1, max_entries)
+        self.version: Optional[int] = None
+        self.overlay: Optional[ImpactOverlay] = None
+        self.reach: "OrderedDict[int, Dict[int, int]]" = OrderedDict()
+        self.impacts: "OrderedDict[Tuple[int, bool, int], ImpactResult]" = OrderedDict()
+    
+    def get_reach(self, compiled: CompiledGraph, service_id: int) -> Dict[int, int]:
+        """Services reachable from `service_id` with their depths, traversing on a miss"""
+        reach = self.reach.get(service_id)
+        if reach is None:
+            reach = compiled.reachable(service_id)
+            self._put(self.reach, service_id, reach)
+        else:
+            self.reach.move_to_end(service_id)
+        return reach
+    
+    def get_impact(self, key: Tuple[int, bool, int]) -> Optional[ImpactResult]:
+        """A copy of the cached impact for (service id, direct, depth), if any"""
+        impact = self.impacts.get(key)
+        if impact is None:
+            return None
+        self.impacts.move_to_end(key)
+        # Results must not share ImpactResult objects
+        return replace(impact)
+    
+    def put_impact(self, key: Tuple[int, bool, int], impact: ImpactResult) -> None:
+        """Remember an impact (a copy, so the caller's object stays its own)"""
+        self._put(self.impacts, key, replace(impact))
+    
+    def _put(self, entries: OrderedDict, key, value) -> None:
+        entries[key] = value
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+    
+    def bind(self, dependency_manager: DependencyManager, overlay: Optional[ImpactOverlay] = None) -> None:
+        """Reset the cache if the manager or overlay changed since it was filled"""
+        if self.version != dependency_manager.version:
+            self.version = dependency_manager.version
+            self.reach.clear()
+            self.impacts.clear()
+        if self.overlay is not overlay:
+            # Traversals depend only on the graph; impacts also on the overlay
+            self.overlay = overlay
+            self.impacts.clear()
 
 
 class SimulationEngine:
@@ -18,79 +104,94 @@ class SimulationEngine:
     def __init__(self, dependency_manager: DependencyManager):
         self.dependency_manager = dependency_manager
     
-    def simulate_failure(self, failed_services: List[str], peak_hours: bool = False) -> SimulationResult:
+    def simulate_failure(
+        self,
+        failed_services: List[str],
+        peak_hours: bool = False,
+        cache: Optional[TraversalCache] = None,
+        overlay: Optional[ImpactOverlay] = None
+    ) -> SimulationResult:
         """
         Simulate failure of one or more services and calculate impact
         
         Args:
             failed_services: List of service names to simulate as failed
             peak_hours: Whether this failure occurs during peak hours (default: False)
+            cache: Optional TraversalCache to reuse cascade traversals and
+                per-service impacts across calls (e.g. in a batch)
+            overlay: Optional what-if importance/MTTR overrides for this
+                simulation only; the dependency manager is never modified
             
         Returns:
             SimulationResult with complete impact analysis
+        """
+        start = time.perf_counter()
+        compiled, failed_ids, overlay = self._prepare(failed_services, cache, overlay)
+        failed_set = set(failed_ids)
         
-        Args:
-            failed_services: List of service names to simulate as failed
-            
-        Returns:
-            SimulationResult with complete impact analysis
+        # Shortest cascade depth per affected service. A service reached from
+        # several failures keeps its highest score, which is the one at the
+        # smallest depth since the cascade multiplier decreases with depth.
+        depths: Dict[int, int] = {}
+        for failed_id in failed_ids:
+            depths.setdefault(failed_id, 0)
+            if cache is None:
+                reach = compiled.reachable(failed_id)
+            else:
+                reach = cache.get_reach(compiled, failed_id)
+            for affected_id, depth in reach.items():
+                if affected_id in failed_set:
+                    continue
+                existing = depths.get(affected_id)
+                if existing is None or depth < existing:
+                    depths[affected_id] = depth
+        
+        propagated = time.perf_counter()
+        
+        impacts = [
+            self._impact_for(compiled, service_id, service_id in failed_set, depth, cache, overlay)
+            for service_id, depth in depths.items()
+        ]
+        result = self.build_result(failed_services, impacts, peak_hours=peak_hours)
+        
+        SIMULATION_STAGE_SECONDS.observe(propagated - start, "propagate")
+        SIMULATION_STAGE_SECONDS.observe(time.perf_counter() - propagated, "score")
+        return result
+    
+    def iter_impacts(
+        self,
+        failed_services: List[str],
+        cache: Optional[TraversalCache] = None,
+        overlay: Optional[ImpactOverlay] = None
+    ) -> Iterator[ImpactResult]:
         """
-        # Validate services exist
-        for service_name in failed_services:
-            if service_name not in self.dependency_manager.services:
-                raise ValueError(f"Service '{service_name}' not found in configuration")
+        Lazily compute the impacts of a failure, nearest services first
         
-        impacts_by_service = {}
-        all_affected_services = set(failed_services)
-        all_business_processes = set()
+        Yields the failed services, then affected services in non-decreasing
+        cascade depth, each as soon as its shortest depth is known. The impacts
+        are the same as simulate_failure's; pass them to build_result for the
+        totals. Unknown services raise ValueError before anything is yielded.
+        """
+        compiled, failed_ids, overlay = self._prepare(failed_services, cache, overlay)
         
-        # Calculate impact for each failed service and its dependents
-        for failed_service_name in failed_services:
-            # Get the service
-            failed_service = self.dependency_manager.get_service(failed_service_name)
-            
-            # Direct impact
-            direct_impact = self._calculate_impact(
-                service=failed_service,
-                is_direct_failure=True,
-                cascade_depth=0,
-                caused_by_services=[]
-            )
-            impacts_by_service[failed_service.name] = direct_impact
-            all_business_processes.update(direct_impact.affected_business_processes)
-            
-            # Cascading impact
-            affected_services = self.dependency_manager.get_all_dependents(failed_service_name)
-            all_affected_services.update(affected_services)
-            
-            for affected_service_name in affected_services:
-                if affected_service_name in failed_services:
-                    continue
-                affected_service = self.dependency_manager.get_service(affected_service_name)
-                cascade_depth = self.dependency_manager.get_cascade_depth(
-                    failed_service_name,
-                    affected_service_name
-                )
-                
-                # Calculate which failed services cause this impact
-                causing_services = [
-                    fs for fs in failed_services
-                    if affected_service_name in self.dependency_manager.get_all_dependents(fs)
-                ]
-                
-                cascade_impact = self._calculate_impact(
-                    service=affected_service,
-                    is_direct_failure=False,
-                    cascade_depth=cascade_depth,
-                    caused_by_services=causing_services
-                )
-                existing = impacts_by_service.get(affected_service_name)
-                if existing is None or cascade_impact.impact_score > existing.impact_score:
-                    impacts_by_service[affected_service_name] = cascade_impact
-                all_business_processes.update(cascade_impact.affected_business_processes)
+        def generate():
+            for service_id, depth in compiled.iter_cascade(failed_ids):
+                yield self._impact_for(compiled, service_id, depth == 0, depth, cache, overlay)
+        
+        return generate()
+    
+    def build_result(
+        self,
+        failed_services: List[str],
+        impacts: List[ImpactResult],
+        peak_hours: bool = False
+    ) -> SimulationResult:
+        """Total up a failure's impacts into a SimulationResult"""
+        all_business_processes = set()
+        for impact in impacts:
+            all_business_processes.update(impact.affected_business_processes)
         
         # Calculate total impact score
-        impacts = list(impacts_by_service.values())
         total_impact = sum(impact.impact_score for impact in impacts)
         
         # Apply peak hours multiplier if applicable
@@ -103,16 +204,66 @@ class SimulationEngine:
             impacts=impacts,
             total_impact_score=total_impact,
             affected_business_processes=all_business_processes,
-            total_services_affected=len(all_affected_services),
+            total_services_affected=len(impacts),
             peak_hours=peak_hours
         )
     
+    def _prepare(
+        self,
+        failed_services: List[str],
+        cache: Optional[TraversalCache],
+        overlay: Optional[ImpactOverlay]
+    ) -> Tuple[CompiledGraph, List[int], Optional[ImpactOverlay]]:
+        """Compile the graph, bind the cache and validate service names"""
+        compiled = self.dependency_manager.compile()
+        if not overlay:
+            overlay = None
+        if cache is not None:
+            cache.bind(self.dependency_manager, overlay)
+        if overlay is not None:
+            for service_name in overlay.mttr:
+                if service_name not in compiled.index:
+                    raise ValueError(f"Service '{service_name}' not found in configuration")
+        
+        # Validate services exist
+        failed_ids = []
+        for service_name in failed_services:
+            service_id = compiled.index.get(service_name)
+            if service_id is None:
+                raise ValueError(f"Service '{service_name}' not found in configuration")
+            failed_ids.append(service_id)
+        return compiled, failed_ids, overlay
+    
+    def _impact_for(
+        self,
+        compiled: CompiledGraph,
+        service_id: int,
+        is_direct: bool,
+        depth: int,
+        cache: Optional[TraversalCache],
+        overlay: Optional[ImpactOverlay]
+    ) -> ImpactResult:
+        """Calculate (or reuse from the cache) one service's impact"""
+        impact = cache.get_impact((service_id, is_direct, depth)) if cache is not None else None
+        if impact is None:
+            impact = self._calculate_impact(
+                compiled,
+                record=compiled.records[service_id],
+                is_direct_failure=is_direct,
+                cascade_depth=depth,
+                overlay=overlay
+            )
+            if cache is not None:
+                cache.put_impact((service_id, is_direct, depth), impact)
+        return impact
+    
     def _calculate_impact(
         self,
-        service: Service,
+        compiled: CompiledGraph,
+        record: ServiceRecord,
         is_direct_failure: bool,
         cascade_depth: int,
-        caused_by_services: List[str]
+        overlay: Optional[ImpactOverlay] = None
     ) -> ImpactResult:
         """
         Calculate impact for a single service
@@ -123,17 +274,24 @@ class SimulationEngine:
         - Dependency multiplier: log2(1 + num_dependents)
         """
         # Get dependents
-        dependents = self.dependency_manager.get_dependents(service.name)
+        dependents = compiled.dependent_names[record.id]
+        
+        # Overlay MTTR replaces the record's for this simulation only
+        if overlay is not None and record.name in overlay.mttr:
+            record = record.replace(mttr=overlay.mttr[record.name])
         
         # Calculate base impact using business process importance if defined
         process_importance = None
-        if service.business_process:
-            process_importance = self.dependency_manager.get_process_importance(service.business_process)
+        if record.business_process:
+            if overlay is not None:
+                process_importance = overlay.process_importance.get(record.business_process)
+            if process_importance is None:
+                process_importance = self.dependency_manager.get_process_importance(record.business_process)
         
-        effective_importance = process_importance if process_importance is not None else service.importance
+        effective_importance = process_importance if process_importance is not None else record.importance
         effective_importance = max(1, min(10, int(effective_importance)))
         
-        base_impact = service.mttr * effective_importance
+        base_impact = record.mttr * effective_importance
         
         # Apply cascade reduction for indirect failures
         if is_direct_failure:
@@ -149,16 +307,16 @@ class SimulationEngine:
         impact_score = base_impact * cascade_multiplier * dependency_multiplier
         
         # Affected business processes
-        affected_processes = [service.business_process] if service.business_process else []
+        affected_processes = [record.business_process] if record.business_process else []
         
         return ImpactResult(
-            service=service,
+            service=record,
             is_direct_failure=is_direct_failure,
             affected_business_processes=affected_processes,
             cascade_depth=cascade_depth,
-            dependent_services=dependents,
+            dependent_services=list(dependents),
             impact_score=round(impact_score, 2),
-            estimated_downtime=service.mttr
+            estimated_downtime=record.mttr
         )
     
     def compare_scenarios(
@@ -181,6 +339,60 @@ class SimulationEngine:
         
         return results
     
+    def iter_simulations(
+        self,
+        scenarios: Iterable[Scenario],
+        stats: Optional[BatchStats] = None,
+        cache_size: int = BATCH_DEDUP_CACHE_SIZE,
+        traversal_cache: Optional[TraversalCache] = None,
+        overlay: Optional[ImpactOverlay] = None
+    ) -> Iterator[Tuple[Scenario, Optional[SimulationResult], Optional[str]]]:
+        """
+        Lazily simulate a stream of scenarios
+        
+        Yields (scenario, result, error) one scenario at a time so arbitrarily
+        large suites run in constant memory. Scenarios are canonicalized
+        (sorted unique failed services plus peak flag) and each distinct key
+        is simulated once while it stays in a bounded LRU memo; duplicates get
+        a copy of the shared result carrying their own failed_services list.
+        Pass a (bounded) `traversal_cache` to also share cascade traversals
+        and per-service impacts between distinct keys; none is kept by
+        default, so long streams hold only the memo. A scenario naming an
+        unknown service yields its error instead of stopping the stream. Pass
+        `stats` to collect dedup counters and `overlay` to apply what-if
+        overrides to every scenario.
+        """
+        if stats is None:
+            stats = BatchStats()
+        memo: "OrderedDict[Tuple[Tuple[str, ...], bool], Tuple[Optional[SimulationResult], Optional[str]]]" = OrderedDict()
+        
+        for scenario in scenarios:
+            stats.scenarios += 1
+            key = canonical_failure_key(scenario.failed_services, scenario.peak_hours)
+            cached = memo.get(key)
+            if cached is None:
+                stats.simulated += 1
+                try:
+                    cached = (
+                        self.simulate_failure(list(key[0]), peak_hours=key[1], cache=traversal_cache, overlay=overlay),
+                        None
+                    )
+                except ValueError as e:
+                    cached = (None, str(e))
+                memo[key] = cached
+                if len(memo) > cache_size:
+                    memo.popitem(last=False)
+            else:
+                memo.move_to_end(key)
+            
+            result, error = cached
+            if result is None:
+                stats.errors += 1
+                yield scenario, None, error
+                continue
+            # Shares impacts with the other scenarios of the same key
+            yield scenario, replace(result, failed_services=list(scenario.failed_services)), None
+    
     def find_critical_paths(self, service_name: str) -> List[List[str]]:
         """
         Find all paths from a service to its dependents